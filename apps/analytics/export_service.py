@@ -4,6 +4,7 @@ Export service for generating CSV and PDF reports.
 
 import csv
 import io
+import re
 from datetime import datetime
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
@@ -15,6 +16,41 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from config.mongodb import get_collection
 
 
+APPLICATION_CSV_HEADER = [
+    'Company',
+    'Job Title',
+    'Status',
+    'Applied Date',
+    'Source',
+    'Employment Type',
+    'Work Mode',
+    'Experience Level',
+    'Salary Min',
+    'Salary Max',
+    'Location',
+    'Industry',
+    'Notes'
+]
+
+# Fields read for the applications CSV
+APPLICATION_CSV_PROJECTION = {
+    '_id': 0,
+    'company.name': 1,
+    'company.location': 1,
+    'company.industry': 1,
+    'job.title': 1,
+    'job.employment_type': 1,
+    'job.work_mode': 1,
+    'job.experience_level': 1,
+    'job.salary_min': 1,
+    'job.salary_max': 1,
+    'application.status': 1,
+    'application.applied_date': 1,
+    'application.source': 1,
+    'notes': 1,
+}
+
+
 class ExportService:
     """Service for exporting application data."""
 
@@ -23,6 +59,15 @@ class ExportService:
 
     def export_applications_csv(self, user_id, filters=None):
         """Export applications to CSV format."""
+        return ''.join(self.iter_applications_csv(user_id, filters))
+
+    def iter_applications_csv(self, user_id, filters=None, batch_size=500):
+        """
+        Generate the applications CSV in chunks of ``batch_size`` rows.
+
+        Only the exported columns are fetched and the cursor is read in
+        batches, so memory stays flat regardless of the number of rows.
+        """
         # Build query
         query = {'user_id': user_id}
 
@@ -31,35 +76,25 @@ class ExportService:
                 query['application.status'] = filters['status']
             if filters.get('company'):
                 query['company.name'] = {
-                    '$regex': filters['company'], '$options': 'i'}
+                    '$regex': re.escape(filters['company']), '$options': 'i'}
 
-        # Get applications
-        applications = list(
-            self.applications_collection.find(query).sort('created_at', -1)
+        applications = (
+            self.applications_collection.find(query, APPLICATION_CSV_PROJECTION)
+            .sort('created_at', -1)
+            .batch_size(batch_size)
         )
 
-        # Create CSV in memory
         output = io.StringIO()
         writer = csv.writer(output)
 
         # Write header
-        writer.writerow([
-            'Company',
-            'Job Title',
-            'Status',
-            'Applied Date',
-            'Source',
-            'Employment Type',
-            'Work Mode',
-            'Experience Level',
-            'Salary Min',
-            'Salary Max',
-            'Location',
-            'Industry',
-            'Notes'
-        ])
+        writer.writerow(APPLICATION_CSV_HEADER)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
 
         # Write data
+        rows = 0
         for app in applications:
             company = app.get('company', {})
             job = app.get('job', {})
@@ -82,7 +117,13 @@ class ExportService:
                 app.get('notes', '')
             ])
 
-        return output.getvalue()
+            rows += 1
+            if rows % batch_size == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+
+        yield output.getvalue()
 
     def export_applications_pdf(self, user_id, filters=None):
         """Export applications to PDF format."""
@@ -207,8 +248,8 @@ class ExportService:
     def export_analytics_csv(self, user_id):
         """Export analytics data to CSV."""
         # Get statistics
-        from apps.analytics.services import AnalyticsService
-        analytics_service = AnalyticsService()
+        from apps.analytics.rollup import AnalyticsRollupService
+        analytics_service = AnalyticsRollupService()
 
         dashboard_stats = analytics_service.get_dashboard_stats(user_id)
         apps_over_time = analytics_service.get_applications_over_time(
@@ -274,17 +315,12 @@ class ExportService:
             'Glassdoor Rating',
             'Is Favorite',
             'Tags',
-            'Notes'
+            'Notes',
+            'Applications'
         ])
 
         # Write data
         for company in companies:
-            # Count applications
-            app_count = self.applications_collection.count_documents({
-                'user_id': user_id,
-                'company.name': company['name']
-            })
-
             writer.writerow([
                 company.get('name', ''),
                 company.get('industry', ''),
@@ -294,7 +330,8 @@ class ExportService:
                 company.get('glassdoor_rating', ''),
                 company.get('is_favorite', False),
                 ', '.join(company.get('tags', [])),
-                company.get('notes', '')
+                company.get('notes', ''),
+                company.get('application_count', 0)
             ])
 
         return output.getvalue()
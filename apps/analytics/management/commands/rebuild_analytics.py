@@ -0,0 +1,30 @@
+"""
+Rebuild the materialized per-user analytics rollup.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollup import AnalyticsRollupService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild user_analytics rollup documents from applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Only rebuild the rollup for this user.'
+        )
+
+    def handle(self, *args, **options):
+        service = AnalyticsRollupService()
+
+        if options['user_id'] is not None:
+            service.rebuild(options['user_id'])
+            count = 1
+        else:
+            count = service.rebuild_all()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt analytics rollup for {count} users'))
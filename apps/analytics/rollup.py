@@ -0,0 +1,380 @@
+"""
+Materialized per-user analytics rollup.
+
+Each user has one document in the ``user_analytics`` collection holding
+pre-aggregated counters for their applications. ApplicationService keeps it
+current with $inc on every write, and the analytics endpoints read it instead
+of re-aggregating the applications collection.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from config.mongodb import get_collection, encode_field_key, decode_field_key
+from .services import CLOSED_STATUSES
+
+
+EPOCH = datetime(1970, 1, 1)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Fields an application contributes to the rollup
+ROLLUP_PROJECTION = {
+    'company.name': 1,
+    'job.salary_min': 1,
+    'job.salary_max': 1,
+    'application.status': 1,
+    'application.source': 1,
+    'requirements.skills_required': 1,
+    'timeline.event_type': 1,
+    'created_at': 1,
+}
+
+
+def application_contributions(app):
+    """Return the rollup counter increments for a single application."""
+    inc = Counter()
+    company = app.get('company') or {}
+    job = app.get('job') or {}
+    application = app.get('application') or {}
+    requirements = app.get('requirements') or {}
+    status = application.get('status')
+
+    inc['total'] += 1
+    inc[f'status.{encode_field_key(status)}'] += 1
+    inc[f"sources.{encode_field_key(application.get('source'))}"] += 1
+    inc[f"companies.{encode_field_key(company.get('name'))}"] += 1
+
+    created = app.get('created_at')
+    if isinstance(created, datetime):
+        # Week numbers follow MongoDB's $week (weeks start on Sunday)
+        inc[f'monthly.{created:%Y-%m}'] += 1
+        inc[f"weekly.{created.year}-W{int(created.strftime('%U')):02d}"] += 1
+        inc[f'daily.{created:%Y-%m-%d}'] += 1
+
+        if status not in CLOSED_STATUSES:
+            inc['pipeline.count'] += 1
+            inc['pipeline.created_seconds'] += int(
+                (created.replace(tzinfo=None) - EPOCH).total_seconds())
+
+    for skill in requirements.get('skills_required') or []:
+        inc[f'skills.{encode_field_key(skill)}'] += 1
+
+    for event in app.get('timeline') or []:
+        inc[f"timeline_events.{encode_field_key(event.get('event_type'))}"] += 1
+
+    if job.get('salary_min') is not None:
+        inc['salary.count'] += 1
+        inc['salary.sum_min'] += job['salary_min']
+        if isinstance(job.get('salary_max'), (int, float)):
+            inc['salary.count_max'] += 1
+            inc['salary.sum_max'] += job['salary_max']
+
+    return inc
+
+
+def _salary_bounds(app):
+    """Return the (min, max) salary an application contributes, if any."""
+    job = app.get('job') or {}
+    if job.get('salary_min') is None:
+        return None, None
+    return job['salary_min'], job.get('salary_max')
+
+
+def _decoded(counts):
+    """Decode a counter map, dropping keys that have been decremented away."""
+    return {
+        decode_field_key(key): count
+        for key, count in (counts or {}).items()
+        if count > 0
+    }
+
+
+class AnalyticsRollupService:
+    """Service class for the materialized analytics rollup."""
+
+    def __init__(self):
+        self.collection = get_collection('user_analytics')
+        self.applications_collection = get_collection('applications')
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def apply_changes(self, user_id, added=(), removed=()):
+        """
+        Apply application writes to the user's rollup.
+
+        ``added`` and ``removed`` are application documents; an update is
+        passed as the old document removed and the new one added. Users
+        without a rollup are skipped, it is built in full on first read.
+        """
+        inc = Counter()
+        for app in added:
+            inc.update(application_contributions(app))
+        for app in removed:
+            inc.subtract(application_contributions(app))
+
+        update = {'$set': {'updated_at': datetime.utcnow()}}
+
+        inc = {key: value for key, value in inc.items() if value}
+        if inc:
+            update['$inc'] = inc
+
+        added_bounds = [_salary_bounds(app) for app in added]
+        lows = [low for low, _ in added_bounds if low is not None]
+        highs = [high for _, high in added_bounds if high is not None]
+        if lows:
+            update['$min'] = {'salary.min': min(lows)}
+        if highs:
+            update['$max'] = {'salary.max': max(highs)}
+
+        if len(update) == 1:
+            return
+
+        rollup = self.collection.find_one_and_update(
+            {'user_id': user_id},
+            update,
+            projection={'salary': 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if rollup is None:
+            return
+
+        # $min/$max cannot be undone, so recompute the bounds when a
+        # removed application may have held one of them.
+        salary = rollup.get('salary', {})
+        for low, high in (_salary_bounds(app) for app in removed):
+            if (low is not None and low <= salary.get('min', low)) or \
+                    (high is not None and high >= salary.get('max', high)):
+                self._refresh_salary_bounds(user_id)
+                break
+
+    def record_timeline_events(self, user_id, events):
+        """Count timeline events pushed onto an existing application."""
+        inc = Counter(
+            f"timeline_events.{encode_field_key(event.get('event_type'))}"
+            for event in events
+        )
+        if not inc:
+            return
+
+        self.collection.update_one(
+            {'user_id': user_id},
+            {
+                '$inc': dict(inc),
+                '$set': {'updated_at': datetime.utcnow()}
+            }
+        )
+
+    def rebuild(self, user_id):
+        """Rebuild a user's rollup from their applications."""
+        totals = Counter()
+        lows, highs = [], []
+
+        applications = self.applications_collection.find(
+            {'user_id': user_id}, ROLLUP_PROJECTION).batch_size(1000)
+        for app in applications:
+            totals.update(application_contributions(app))
+            low, high = _salary_bounds(app)
+            if low is not None:
+                lows.append(low)
+            if isinstance(high, (int, float)):
+                highs.append(high)
+
+        rollup = {
+            'user_id': user_id,
+            'total': 0,
+            'status': {},
+            'sources': {},
+            'companies': {},
+            'monthly': {},
+            'weekly': {},
+            'daily': {},
+            'skills': {},
+            'timeline_events': {},
+            'pipeline': {'count': 0, 'created_seconds': 0},
+            'salary': {'count': 0, 'sum_min': 0, 'count_max': 0, 'sum_max': 0},
+        }
+        for key, value in totals.items():
+            if '.' in key:
+                section, name = key.split('.', 1)
+                rollup[section][name] = value
+            else:
+                rollup[key] = value
+
+        if lows:
+            rollup['salary']['min'] = min(lows)
+        if highs:
+            rollup['salary']['max'] = max(highs)
+        rollup['updated_at'] = datetime.utcnow()
+
+        self.collection.replace_one({'user_id': user_id}, rollup, upsert=True)
+        return rollup
+
+    def rebuild_all(self):
+        """Rebuild the rollup of every user with applications."""
+        user_ids = self.applications_collection.distinct('user_id')
+        for user_id in user_ids:
+            self.rebuild(user_id)
+        return len(user_ids)
+
+    def get_rollup(self, user_id):
+        """Get a user's rollup, building it on first access."""
+        rollup = self.collection.find_one({'user_id': user_id})
+        if rollup is None:
+            rollup = self.rebuild(user_id)
+        return rollup
+
+    def _refresh_salary_bounds(self, user_id):
+        """Recompute the salary min/max of a rollup from applications."""
+        pipeline = [
+            {'$match': {
+                'user_id': user_id,
+                'job.salary_min': {'$exists': True, '$ne': None}
+            }},
+            {'$group': {
+                '_id': None,
+                'min_salary': {'$min': '$job.salary_min'},
+                'max_salary': {'$max': '$job.salary_max'}
+            }}
+        ]
+
+        results = list(self.applications_collection.aggregate(pipeline))
+        bounds = results[0] if results else {}
+
+        update = {}
+        for field, value in (('salary.min', bounds.get('min_salary')),
+                             ('salary.max', bounds.get('max_salary'))):
+            if value is None:
+                update.setdefault('$unset', {})[field] = ''
+            else:
+                update.setdefault('$set', {})[field] = value
+
+        self.collection.update_one({'user_id': user_id}, update)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_dashboard_stats(self, user_id):
+        """
+        Get dashboard statistics from the rollup.
+
+        The last-30-days count uses whole daily buckets and the average days
+        in pipeline is derived from summed creation times, so both can differ
+        slightly from AnalyticsService.get_dashboard_stats.
+        """
+        rollup = self.get_rollup(user_id)
+        now = datetime.utcnow()
+
+        status_breakdown = _decoded(rollup.get('status'))
+        total = sum(status_breakdown.values())
+
+        # Calculate success rate (offers / total)
+        offers = status_breakdown.get(
+            'offer', 0) + status_breakdown.get('accepted', 0)
+        success_rate = (offers / total * 100) if total > 0 else 0
+
+        # Response rate (not rejected / total)
+        rejected = status_breakdown.get('rejected', 0)
+        withdrawn = status_breakdown.get('withdrawn', 0)
+        response_rate = ((total - rejected - withdrawn) /
+                         total * 100) if total > 0 else 0
+
+        # Applications in last 30 days
+        first_day = f'{now - timedelta(days=30):%Y-%m-%d}'
+        recent = sum(
+            count for day, count in rollup.get('daily', {}).items()
+            if day >= first_day
+        )
+
+        # Average days in pipeline
+        pipeline = rollup.get('pipeline', {})
+        avg_days = 0
+        if pipeline.get('count', 0) > 0:
+            now_seconds = (now - EPOCH).total_seconds()
+            avg_seconds = now_seconds - \
+                pipeline['created_seconds'] / pipeline['count']
+            avg_days = int(avg_seconds // SECONDS_PER_DAY)
+
+        companies = _decoded(rollup.get('companies'))
+        top_companies = sorted(
+            companies.items(), key=lambda item: item[1], reverse=True)[:5]
+
+        sources = _decoded(rollup.get('sources'))
+        top_sources = sorted(
+            sources.items(), key=lambda item: item[1], reverse=True)
+
+        return {
+            'total_applications': total,
+            'status_breakdown': status_breakdown,
+            'success_rate': round(success_rate, 2),
+            'response_rate': round(response_rate, 2),
+            'applications_last_30_days': recent,
+            'average_days_in_pipeline': avg_days,
+            'top_companies': [
+                {'company': company, 'count': count}
+                for company, count in top_companies
+            ],
+            'top_sources': [
+                {'source': source or 'Unknown', 'count': count}
+                for source, count in top_sources
+            ]
+        }
+
+    def get_applications_over_time(self, user_id, period='month'):
+        """Get application counts over time from the rollup."""
+        section = {'month': 'monthly', 'week': 'weekly'}.get(period, 'daily')
+        buckets = self.get_rollup(user_id).get(section, {})
+
+        return [
+            {'period': label, 'count': count}
+            for label, count in sorted(buckets.items())
+            if count > 0
+        ]
+
+    def get_skills_demand(self, user_id):
+        """Get the most demanded skills from the rollup."""
+        skills = _decoded(self.get_rollup(user_id).get('skills'))
+        top_skills = sorted(
+            skills.items(), key=lambda item: item[1], reverse=True)[:20]
+
+        return [
+            {'skill': skill, 'count': count}
+            for skill, count in top_skills
+        ]
+
+    def get_application_timeline_analysis(self, user_id):
+        """Get timeline event counts from the rollup."""
+        events = _decoded(self.get_rollup(user_id).get('timeline_events'))
+
+        return [
+            {'event_type': event_type, 'count': count}
+            for event_type, count in sorted(
+                events.items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    def get_salary_insights(self, user_id):
+        """Get salary statistics from the rollup."""
+        salary = self.get_rollup(user_id).get('salary', {})
+        count = salary.get('count', 0)
+
+        if count <= 0:
+            return {
+                'average_min': 0,
+                'average_max': 0,
+                'lowest': 0,
+                'highest': 0,
+                'total_with_salary': 0
+            }
+
+        count_max = salary.get('count_max', 0)
+        return {
+            'average_min': round(salary.get('sum_min', 0) / count),
+            'average_max': round(salary.get('sum_max', 0) / count_max) if count_max > 0 else 0,
+            'lowest': salary.get('min', 0),
+            'highest': salary.get('max', 0),
+            'total_with_salary': count
+        }
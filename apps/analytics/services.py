@@ -7,6 +7,47 @@ from collections import defaultdict
 from config.mongodb import get_collection
 
 
+# Statuses that take an application out of the pipeline
+CLOSED_STATUSES = ['offer', 'accepted', 'rejected', 'withdrawn']
+
+MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def response_days_stages():
+    """
+    Pipeline stages that reduce each application to its response time.
+
+    The response is the earliest timeline event dated after applied_date;
+    each output document has the whole number of days until then. Only
+    applications with such an event are kept.
+    """
+    first_response = {'$min': {'$filter': {
+        'input': '$timeline.date',
+        'as': 'date',
+        'cond': {'$gt': ['$$date', '$application.applied_date']}
+    }}}
+
+    return [
+        {'$match': {'application.applied_date': {'$type': 'date'}}},
+        {'$project': {
+            '_id': 0,
+            'days': {'$let': {
+                'vars': {'first_response': first_response},
+                'in': {'$cond': [
+                    {'$ne': ['$$first_response', None]},
+                    {'$floor': {'$divide': [
+                        {'$subtract': [
+                            '$$first_response', '$application.applied_date']},
+                        MILLISECONDS_PER_DAY
+                    ]}},
+                    None
+                ]}
+            }}
+        }},
+        {'$match': {'days': {'$ne': None}}}
+    ]
+
+
 class AnalyticsService:
     """Service class for analytics operations."""
 
@@ -14,22 +55,68 @@ class AnalyticsService:
         self.collection = get_collection('applications')
 
     def get_dashboard_stats(self, user_id):
-        """Get comprehensive dashboard statistics."""
-        # Total applications
-        total = self.collection.count_documents({'user_id': user_id})
+        """Get comprehensive dashboard statistics in a single aggregation."""
+        now = datetime.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
 
-        # Status breakdown
-        status_pipeline = [
+        pipeline = [
             {'$match': {'user_id': user_id}},
-            {'$group': {
-                '_id': '$application.status',
-                'count': {'$sum': 1}
+            {'$facet': {
+                # Status breakdown
+                'status_breakdown': [
+                    {'$group': {
+                        '_id': '$application.status',
+                        'count': {'$sum': 1}
+                    }}
+                ],
+                # Applications in last 30 days
+                'recent': [
+                    {'$match': {'created_at': {'$gte': thirty_days_ago}}},
+                    {'$count': 'count'}
+                ],
+                # Days open applications have spent in the pipeline
+                'pipeline_days': [
+                    {'$match': {
+                        'application.status': {'$nin': CLOSED_STATUSES},
+                        'created_at': {'$type': 'date'}
+                    }},
+                    {'$group': {
+                        '_id': None,
+                        'total_days': {'$sum': {'$floor': {'$divide': [
+                            {'$subtract': [now, '$created_at']},
+                            MILLISECONDS_PER_DAY
+                        ]}}},
+                        'count': {'$sum': 1}
+                    }}
+                ],
+                # Top companies
+                'top_companies': [
+                    {'$group': {
+                        '_id': '$company.name',
+                        'count': {'$sum': 1}
+                    }},
+                    {'$sort': {'count': -1}},
+                    {'$limit': 5}
+                ],
+                # Top sources
+                'top_sources': [
+                    {'$group': {
+                        '_id': '$application.source',
+                        'count': {'$sum': 1}
+                    }},
+                    {'$sort': {'count': -1}}
+                ]
             }}
         ]
+
+        facets = next(self.collection.aggregate(pipeline))
+
         status_breakdown = {}
-        for result in self.collection.aggregate(status_pipeline):
+        for result in facets['status_breakdown']:
             status_breakdown[result['_id']] = result['count']
 
+        total = sum(status_breakdown.values())
+
         # Calculate success rate (offers / total)
         offers = status_breakdown.get(
             'offer', 0) + status_breakdown.get('accepted', 0)
@@ -41,21 +128,12 @@ class AnalyticsService:
         response_rate = ((total - rejected - withdrawn) /
                          total * 100) if total > 0 else 0
 
-        # Applications in last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent = self.collection.count_documents({
-            'user_id': user_id,
-            'created_at': {'$gte': thirty_days_ago}
-        })
-
-        # Average days in pipeline
-        avg_days = self._calculate_average_days(user_id)
+        recent = facets['recent'][0]['count'] if facets['recent'] else 0
 
-        # Top companies
-        top_companies = self._get_top_companies(user_id, limit=5)
-
-        # Top sources
-        top_sources = self._get_top_sources(user_id)
+        avg_days = 0
+        if facets['pipeline_days']:
+            days = facets['pipeline_days'][0]
+            avg_days = round(days['total_days'] / days['count'])
 
         return {
             'total_applications': total,
@@ -64,8 +142,15 @@ class AnalyticsService:
             'response_rate': round(response_rate, 2),
             'applications_last_30_days': recent,
             'average_days_in_pipeline': avg_days,
-            'top_companies': top_companies,
-            'top_sources': top_sources
+            'top_companies': [
+                {'company': result['_id'], 'count': result['count']}
+                for result in facets['top_companies']
+            ],
+            'top_sources': [
+                {'source': result['_id'] or 'Unknown',
+                    'count': result['count']}
+                for result in facets['top_sources']
+            ]
         }
 
     def get_applications_over_time(self, user_id, period='month'):
@@ -242,32 +327,21 @@ class AnalyticsService:
 
     def get_response_time_analysis(self, user_id):
         """Analyze how long it takes companies to respond."""
-        applications = list(self.collection.find(
-            {'user_id': user_id},
-            {'application.applied_date': 1, 'timeline': 1, 'company.name': 1}
-        ))
-
-        response_times = []
-
-        for app in applications:
-            applied_date = app.get('application', {}).get('applied_date')
-            timeline = app.get('timeline', [])
-
-            if not applied_date or not timeline:
-                continue
-
-            # Find first response (first timeline event after application)
-            for event in sorted(timeline, key=lambda x: x.get('date', datetime.min)):
-                event_date = event.get('date')
-                if event_date and event_date > applied_date:
-                    days = (event_date - applied_date).days
-                    response_times.append({
-                        'company': app.get('company', {}).get('name', 'Unknown'),
-                        'days': days
-                    })
-                    break
-
-        if not response_times:
+        pipeline = [
+            {'$match': {'user_id': user_id}},
+            *response_days_stages(),
+            {'$group': {
+                '_id': None,
+                'average_days': {'$avg': '$days'},
+                'fastest': {'$min': '$days'},
+                'slowest': {'$max': '$days'},
+                'total_responses': {'$sum': 1}
+            }}
+        ]
+
+        results = list(self.collection.aggregate(pipeline))
+
+        if not results:
             return {
                 'average_days': 0,
                 'fastest': 0,
@@ -275,74 +349,10 @@ class AnalyticsService:
                 'total_responses': 0
             }
 
-        days_list = [r['days'] for r in response_times]
-
+        data = results[0]
         return {
-            'average_days': round(sum(days_list) / len(days_list), 1),
-            'fastest': min(days_list),
-            'slowest': max(days_list),
-            'total_responses': len(response_times)
+            'average_days': round(data['average_days'], 1),
+            'fastest': int(data['fastest']),
+            'slowest': int(data['slowest']),
+            'total_responses': data['total_responses']
         }
-
-    def _calculate_average_days(self, user_id):
-        """Calculate average days applications stay in pipeline."""
-        applications = list(self.collection.find(
-            {'user_id': user_id},
-            {'created_at': 1, 'application.status': 1}
-        ))
-
-        if not applications:
-            return 0
-
-        total_days = 0
-        count = 0
-
-        for app in applications:
-            created = app.get('created_at')
-            status = app.get('application', {}).get('status')
-
-            if created:
-                # If still in pipeline, calculate days until now
-                if status not in ['offer', 'accepted', 'rejected', 'withdrawn']:
-                    days = (datetime.utcnow() - created).days
-                    total_days += days
-                    count += 1
-
-        return round(total_days / count) if count > 0 else 0
-
-    def _get_top_companies(self, user_id, limit=5):
-        """Get companies with most applications."""
-        pipeline = [
-            {'$match': {'user_id': user_id}},
-            {'$group': {
-                '_id': '$company.name',
-                'count': {'$sum': 1}
-            }},
-            {'$sort': {'count': -1}},
-            {'$limit': limit}
-        ]
-
-        results = list(self.collection.aggregate(pipeline))
-
-        return [
-            {'company': result['_id'], 'count': result['count']}
-            for result in results
-        ]
-
-    def _get_top_sources(self, user_id):
-        """Get top application sources."""
-        pipeline = [
-            {'$match': {'user_id': user_id}},
-            {'$group': {
-                '_id': '$application.source',
-                'count': {'$sum': 1}
-            }},
-            {'$sort': {'count': -1}}
-        ]
-
-        results = list(self.collection.aggregate(pipeline))
-
-        return [
-            {'source': result['_id'] or 'Unknown', 'count': result['count']}
-            for result in results
-        ]
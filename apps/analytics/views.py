@@ -1,5 +1,5 @@
 from .export_service import ExportService
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -7,6 +7,7 @@ from rest_framework import status
 from datetime import datetime
 
 from .services import AnalyticsService
+from .rollup import AnalyticsRollupService
 from .serializers import (
     DashboardStatsSerializer,
     TimeSeriesDataSerializer,
@@ -25,7 +26,7 @@ def dashboard_stats(request):
     GET /api/analytics/dashboard/
     Get comprehensive dashboard statistics.
     """
-    service = AnalyticsService()
+    service = AnalyticsRollupService()
     stats = service.get_dashboard_stats(request.user.id)
 
     serializer = DashboardStatsSerializer(stats)
@@ -49,7 +50,7 @@ def applications_over_time(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    service = AnalyticsService()
+    service = AnalyticsRollupService()
     data = service.get_applications_over_time(request.user.id, period)
 
     serializer = TimeSeriesDataSerializer(data, many=True)
@@ -77,7 +78,7 @@ def skills_demand(request):
     GET /api/analytics/skills/
     Get most demanded skills from job postings.
     """
-    service = AnalyticsService()
+    service = AnalyticsRollupService()
     data = service.get_skills_demand(request.user.id)
 
     serializer = SkillDemandSerializer(data, many=True)
@@ -91,7 +92,7 @@ def timeline_analysis(request):
     GET /api/analytics/timeline/
     Analyze interview stages and events.
     """
-    service = AnalyticsService()
+    service = AnalyticsRollupService()
     data = service.get_application_timeline_analysis(request.user.id)
 
     serializer = TimelineAnalysisSerializer(data, many=True)
@@ -105,7 +106,7 @@ def salary_insights(request):
     GET /api/analytics/salary/
     Get salary statistics and insights.
     """
-    service = AnalyticsService()
+    service = AnalyticsRollupService()
     data = service.get_salary_insights(request.user.id)
 
     serializer = SalaryInsightsSerializer(data)
@@ -141,10 +142,10 @@ def export_applications_csv(request):
         filters['company'] = request.GET.get('company')
 
     service = ExportService()
-    csv_data = service.export_applications_csv(request.user.id, filters)
+    csv_rows = service.iter_applications_csv(request.user.id, filters)
 
-    # Create response
-    response = HttpResponse(csv_data, content_type='text/csv')
+    # Stream the response so large exports are never held in memory
+    response = StreamingHttpResponse(csv_rows, content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="applications_{datetime.now().strftime("%Y%m%d")}.csv"'
 
     return response
@@ -2,12 +2,35 @@
 File upload service for handling application attachments.
 """
 
+import hashlib
 import os
 import uuid
 from datetime import datetime
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.core.files.base import File
+
+
+def new_attachment_id():
+    """Stable id of an attachment within its application."""
+    return str(uuid.uuid4())
+
+
+class HashingFile(File):
+    """
+    File whose chunks() computes a SHA-256 of the data as storage reads it.
+    """
+
+    def __init__(self, file, name=None):
+        super().__init__(file, name)
+        self.sha256 = hashlib.sha256()
+        self.bytes_hashed = 0
+
+    def chunks(self, chunk_size=None):
+        for chunk in self.file.chunks(chunk_size):
+            self.sha256.update(chunk)
+            self.bytes_hashed += len(chunk)
+            yield chunk
 
 
 class FileUploadService:
@@ -18,7 +41,9 @@ class FileUploadService:
         'document': ['.pdf', '.doc', '.docx', '.txt', '.jpg', '.jpeg', '.png']
     }
 
-    MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+    MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE
+
+    CHUNK_SIZE = 64 * 1024
 
     @staticmethod
     def validate_file(file, file_type='document'):
@@ -27,7 +52,8 @@ class FileUploadService:
 
         # Check file size
         if file.size > FileUploadService.MAX_FILE_SIZE:
-            errors.append(f'File size exceeds 5MB limit')
+            errors.append(
+                f'File size exceeds {FileUploadService.MAX_FILE_SIZE / (1024 * 1024):g}MB limit')
 
         # Check file extension
         file_ext = os.path.splitext(file.name)[1].lower()
@@ -55,19 +81,22 @@ class FileUploadService:
         file_path = os.path.join('uploads', str(
             user_id), file_type, unique_filename)
 
-        # Save file
+        # Stream the upload to storage, hashing it on the way
         try:
-            saved_path = default_storage.save(
-                file_path, ContentFile(file.read()))
+            content = HashingFile(file, file.name)
+            saved_path = default_storage.save(file_path, content)
+            sha256 = FileUploadService._sha256(content)
 
             # Return file info
             file_info = {
+                'attachment_id': new_attachment_id(),
                 'filename': file.name,
                 'original_name': file.name,
                 'file_path': saved_path,
                 'file_url': f'/media/{saved_path}',
                 'file_size': file.size,
                 'file_type': file_ext[1:],  # Remove dot
+                'sha256': sha256,
                 'uploaded_at': datetime.utcnow()
             }
 
@@ -76,6 +105,21 @@ class FileUploadService:
         except Exception as e:
             return None, [f'Error saving file: {str(e)}']
 
+    @staticmethod
+    def _sha256(content):
+        """
+        Hex digest of a saved HashingFile.
+
+        Storages that read the file without chunks() leave the hash
+        incomplete; the upload is then hashed in a second chunked pass.
+        """
+        if content.bytes_hashed != content.size:
+            content.sha256 = hashlib.sha256()
+            content.seek(0)
+            for chunk in content.file.chunks(FileUploadService.CHUNK_SIZE):
+                content.sha256.update(chunk)
+        return content.sha256.hexdigest()
+
     @staticmethod
     def delete_file(file_path):
         """Delete a file from storage."""
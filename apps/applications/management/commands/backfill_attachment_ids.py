@@ -0,0 +1,27 @@
+"""
+Give existing application attachments a stable attachment_id.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.applications.services import ApplicationService
+
+
+class Command(BaseCommand):
+    help = 'Set attachment_id on attachments created before it existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of updates sent per bulk write.'
+        )
+
+    def handle(self, *args, **options):
+        service = ApplicationService()
+        updated = service.backfill_attachment_ids(
+            batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Set attachment ids on {updated} applications'))
@@ -0,0 +1,43 @@
+"""
+Create or verify the MongoDB indexes declared in config/indexes.py.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.indexes import ensure_indexes
+
+
+class Command(BaseCommand):
+    help = 'Create or verify MongoDB indexes and report missing or unused ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only verify indexes; exit with an error if any are missing.'
+        )
+
+    def handle(self, *args, **options):
+        report = ensure_indexes(create=not options['check'])
+
+        problems = False
+        for collection_name, entry in report.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(collection_name))
+
+            for name in entry['present']:
+                self.stdout.write(f'  ok          {name}')
+            for name in entry['created']:
+                self.stdout.write(self.style.SUCCESS(f'  created     {name}'))
+            for name in entry['missing']:
+                self.stdout.write(self.style.ERROR(f'  missing     {name}'))
+            for name, error in entry['failed'].items():
+                self.stdout.write(self.style.ERROR(f'  failed      {name}: {error}'))
+            for name in entry['unexpected']:
+                self.stdout.write(self.style.WARNING(f'  unexpected  {name}'))
+            for name in entry['unused']:
+                self.stdout.write(self.style.WARNING(f'  unused      {name}'))
+
+            problems = problems or bool(entry['missing'] or entry['failed'])
+
+        if problems:
+            raise CommandError('Some indexes are missing or could not be created')
@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from bson import ObjectId
 from datetime import datetime
+from django.conf import settings
+from config.serialization import CompiledSerializerMixin
 
 
 class CompanySerializer(serializers.Serializer):
@@ -69,6 +72,7 @@ class TimelineEventSerializer(serializers.Serializer):
 
 class AttachmentSerializer(serializers.Serializer):
     """Serializer for file attachments."""
+    attachment_id = serializers.CharField(max_length=36, required=False)
     filename = serializers.CharField(max_length=255)
     file_url = serializers.CharField(max_length=500)
     uploaded_at = serializers.DateTimeField(default=datetime.utcnow)
@@ -76,8 +80,14 @@ class AttachmentSerializer(serializers.Serializer):
         max_length=50, required=False, allow_blank=True)
 
 
-class ApplicationSerializer(serializers.Serializer):
-    """Main serializer for job applications."""
+class ApplicationSerializer(CompiledSerializerMixin, serializers.Serializer):
+    """
+    Main serializer for job applications.
+
+    Output goes through the compiled path (config.serialization); ``id`` is
+    the ObjectId as a string via CharField(source='_id'). Pass ``fields``
+    (paths from parse_fields) to only output those fields.
+    """
     id = serializers.CharField(source='_id', read_only=True)
     user_id = serializers.IntegerField(read_only=True)
     company = CompanySerializer()
@@ -91,12 +101,106 @@ class ApplicationSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
-    def to_representation(self, instance):
-        """Convert ObjectId to string for JSON serialization."""
-        rep = super().to_representation(instance)
-        if '_id' in instance:
-            rep['id'] = str(instance['_id'])
-        return rep
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            _trim_fields(self, fields)
+
+
+# Fields for list rows, requested with ?fields=summary
+SUMMARY_FIELDS = (
+    'id',
+    'company.name',
+    'job.title',
+    'job.work_mode',
+    'job.salary_min',
+    'job.salary_max',
+    'application.status',
+    'application.applied_date',
+    'application.source',
+    'is_favorite',
+    'created_at',
+    'updated_at',
+)
+
+FIELD_PRESETS = {
+    'summary': SUMMARY_FIELDS,
+}
+
+
+def _nested_serializer(field):
+    """The serializer behind a nested field, or None for plain fields."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, serializers.Serializer) else None
+
+
+def _trim_fields(serializer, paths):
+    """Drop every field of a serializer tree not covered by ``paths``."""
+    nested_paths = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        nested_paths.setdefault(name, []).append(rest)
+
+    for name in list(serializer.fields):
+        if name not in nested_paths:
+            serializer.fields.pop(name)
+        elif '' not in nested_paths[name]:
+            _trim_fields(
+                _nested_serializer(serializer.fields[name]), nested_paths[name])
+
+
+def _field_paths(serializer, prefix=''):
+    """All field paths of a serializer tree, e.g. 'company' and 'company.name'."""
+    paths = set()
+    for name, field in serializer.fields.items():
+        path = prefix + name
+        paths.add(path)
+        nested = _nested_serializer(field)
+        if nested is not None:
+            paths |= _field_paths(nested, path + '.')
+    return paths
+
+
+_application_field_paths = None
+
+
+def parse_fields(value):
+    """
+    Parse a ``fields`` query parameter, e.g. 'summary' or 'id,company.name'.
+
+    Returns the sorted field paths with those covered by a requested parent
+    removed. Raises ValueError on unknown fields.
+    """
+    global _application_field_paths
+    if _application_field_paths is None:
+        _application_field_paths = _field_paths(ApplicationSerializer())
+
+    paths = set()
+    for item in value.split(','):
+        item = item.strip()
+        if item:
+            paths.update(FIELD_PRESETS.get(item, (item,)))
+
+    unknown = sorted(paths - _application_field_paths)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    if not paths:
+        raise ValueError('No fields requested')
+
+    return sorted(
+        path for path in paths
+        if not any(path.startswith(other + '.') for other in paths)
+    )
+
+
+def fields_projection(paths):
+    """MongoDB projection for the documents behind the given field paths."""
+    projection = {'_id': 1}
+    for path in paths:
+        if path != 'id':
+            projection[path] = 1
+    return projection
 
 
 class ApplicationCreateSerializer(serializers.Serializer):
@@ -137,6 +241,46 @@ class StatusUpdateSerializer(serializers.Serializer):
         return value
 
 
+class BulkFilterSerializer(serializers.Serializer):
+    """List filters selecting applications for a bulk operation."""
+    status = serializers.CharField(required=False)
+    company = serializers.CharField(required=False)
+    job_title = serializers.CharField(required=False)
+    is_favorite = serializers.BooleanField(required=False)
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """Applications selected by a list of ids or by filters."""
+    ids = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_empty=False)
+    filter = BulkFilterSerializer(required=False)
+
+    def validate_ids(self, value):
+        """Validate ids are ObjectIds and the list is not too long."""
+        if len(value) > settings.BULK_APPLICATIONS_MAX:
+            raise serializers.ValidationError(
+                f'At most {settings.BULK_APPLICATIONS_MAX} ids per request')
+        invalid = [app_id for app_id in value if not ObjectId.is_valid(app_id)]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Invalid application ID: {', '.join(invalid)}")
+        return value
+
+    def validate(self, attrs):
+        """Require exactly one of ids or a non-empty filter."""
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError(
+                'Provide either ids or filter')
+        if 'filter' in attrs and not attrs['filter']:
+            raise serializers.ValidationError(
+                'filter must contain at least one condition')
+        return attrs
+
+
+class BulkStatusUpdateSerializer(BulkSelectionSerializer, StatusUpdateSerializer):
+    """Serializer for changing the status of many applications."""
+
+
 class ApplicationStatisticsSerializer(serializers.Serializer):
     """Serializer for application statistics."""
     total_applications = serializers.IntegerField()
@@ -2,9 +2,68 @@
 Application service layer for MongoDB operations.
 """
 
+import base64
+import json
+import re
 from bson import ObjectId
-from datetime import datetime
+from bson.errors import InvalidId
+from collections import defaultdict
+from datetime import datetime, timedelta
+from django.conf import settings
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from config.mongodb import get_collection
+from apps.companies.services import CompanyService
+from apps.companies.utils import company_name_key
+from apps.analytics.rollup import AnalyticsRollupService
+from .file_service import new_attachment_id
+
+
+# Fields that feed company counters and the analytics rollup
+TRACKED_FIELDS = ('company', 'job', 'application', 'requirements')
+
+# What _record_changes reads from documents changed by bulk operations
+CHANGES_PROJECTION = {
+    **{field: 1 for field in TRACKED_FIELDS},
+    'timeline.event_type': 1,
+    'created_at': 1,
+}
+
+EPOCH = datetime(1970, 1, 1)
+
+SEARCH_MODES = ('auto', 'text', 'prefix')
+
+# Server error code when a $text query has no text index
+INDEX_NOT_FOUND = 27
+
+
+def with_name_key(company):
+    """Copy of an application's company info with its matching name_key."""
+    company = dict(company or {})
+    company['name_key'] = company_name_key(company.get('name'))
+    return company
+
+
+def encode_cursor(application):
+    """Encode an application's (created_at, _id) as an opaque page cursor."""
+    created_at = application['created_at'].replace(tzinfo=None)
+    payload = {
+        'c': (created_at - EPOCH) // timedelta(milliseconds=1),
+        'i': str(application['_id'])
+    }
+    token = base64.urlsafe_b64encode(json.dumps(payload).encode())
+    return token.decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a page cursor, raising ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = EPOCH + timedelta(milliseconds=int(payload['c']))
+        return created_at, ObjectId(payload['i'])
+    except (TypeError, KeyError, InvalidId, ValueError, OverflowError) as exc:
+        raise ValueError('Invalid cursor') from exc
 
 
 class ApplicationService:
@@ -12,12 +71,55 @@ class ApplicationService:
 
     def __init__(self):
         self.collection = get_collection('applications')
+        self.company_service = CompanyService()
+        self.rollup_service = AnalyticsRollupService()
 
     def create_application(self, user_id, data):
         """Create a new job application."""
-        application = {
+        application = self._new_application(user_id, data)
+
+        result = self.collection.insert_one(application)
+        application['_id'] = result.inserted_id
+
+        self._record_changes(user_id, added=[application])
+        return application
+
+    def create_applications(self, user_id, items):
+        """
+        Create a batch of applications with one unordered insert_many.
+
+        Returns the inserted documents and the write errors as
+        ``{'index', 'error'}`` dicts indexed into ``items``. Company counters
+        and analytics are updated once for the whole batch.
+        """
+        applications = [self._new_application(user_id, data) for data in items]
+        if not applications:
+            return {'applications': [], 'errors': []}
+
+        errors = []
+        try:
+            self.collection.insert_many(applications, ordered=False)
+        except BulkWriteError as exc:
+            errors = [
+                {'index': error['index'], 'error': error['errmsg']}
+                for error in exc.details.get('writeErrors', [])
+            ]
+
+        failed = {error['index'] for error in errors}
+        inserted = [
+            application for index, application in enumerate(applications)
+            if index not in failed
+        ]
+
+        if inserted:
+            self._record_changes(user_id, added=inserted)
+        return {'applications': inserted, 'errors': errors}
+
+    def _new_application(self, user_id, data):
+        """Build an application document from validated data."""
+        return {
             'user_id': user_id,
-            'company': data.get('company', {}),
+            'company': with_name_key(data.get('company')),
             'job': data.get('job', {}),
             'application': {
                 'applied_date': data.get('application', {}).get('applied_date', datetime.utcnow()),
@@ -36,10 +138,6 @@ class ApplicationService:
             'updated_at': datetime.utcnow(),
         }
 
-        result = self.collection.insert_one(application)
-        application['_id'] = result.inserted_id
-        return application
-
     def get_application(self, application_id, user_id):
         """Get a single application by ID."""
         return self.collection.find_one({
@@ -47,25 +145,19 @@ class ApplicationService:
             'user_id': user_id
         })
 
-    def get_applications(self, user_id, filters=None, skip=0, limit=20):
-        """Get all applications for a user with optional filters."""
-        query = {'user_id': user_id}
+    def get_applications(self, user_id, filters=None, skip=0, limit=20,
+                         projection=None):
+        """
+        Get all applications for a user with optional filters.
 
-        if filters:
-            if filters.get('status'):
-                query['application.status'] = filters['status']
-            if filters.get('company'):
-                query['company.name'] = {
-                    '$regex': filters['company'], '$options': 'i'}
-            if filters.get('job_title'):
-                query['job.title'] = {
-                    '$regex': filters['job_title'], '$options': 'i'}
-            if filters.get('is_favorite') is not None:
-                query['is_favorite'] = filters['is_favorite']
+        ``projection`` limits the fields read from MongoDB (see
+        serializers.fields_projection).
+        """
+        query = self._build_query(user_id, filters)
 
         total = self.collection.count_documents(query)
         applications = list(
-            self.collection.find(query)
+            self.collection.find(query, projection)
             .sort('created_at', -1)
             .skip(skip)
             .limit(limit)
@@ -76,26 +168,100 @@ class ApplicationService:
             'applications': applications
         }
 
+    def get_applications_after(self, user_id, filters=None, cursor=None,
+                               limit=20, include_count=False, projection=None):
+        """
+        Get a page of applications using keyset pagination.
+
+        ``cursor`` is the opaque token returned as ``next_cursor`` by the
+        previous page. Pages are read with a range query on
+        (created_at, _id), so every page costs the same regardless of depth.
+        """
+        query = self._build_query(user_id, filters)
+        total = self.collection.count_documents(
+            query) if include_count else None
+
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query['created_at'] = {'$lte': created_at}
+            query['$or'] = [
+                {'created_at': {'$lt': created_at}},
+                {'_id': {'$lt': last_id}}
+            ]
+
+        if projection is not None:
+            # The next cursor is built from the last document's created_at
+            projection = {**projection, 'created_at': 1}
+
+        applications = list(
+            self.collection.find(query, projection)
+            .sort([('created_at', -1), ('_id', -1)])
+            .limit(limit + 1)
+        )
+
+        next_cursor = None
+        if len(applications) > limit:
+            applications = applications[:limit]
+            next_cursor = encode_cursor(applications[-1])
+
+        return {
+            'total': total,
+            'applications': applications,
+            'next_cursor': next_cursor
+        }
+
+    def _build_query(self, user_id, filters=None):
+        """Build the list query for a user's applications."""
+        query = {'user_id': user_id}
+
+        if filters:
+            if filters.get('status'):
+                query['application.status'] = filters['status']
+            if filters.get('company'):
+                query['company.name'] = {
+                    '$regex': re.escape(filters['company']), '$options': 'i'}
+            if filters.get('job_title'):
+                query['job.title'] = {
+                    '$regex': re.escape(filters['job_title']), '$options': 'i'}
+            if filters.get('is_favorite') is not None:
+                query['is_favorite'] = filters['is_favorite']
+
+        return query
+
     def update_application(self, application_id, user_id, data):
-        """Update an application."""
+        """
+        Update an application in one round trip.
+
+        When tracked fields change, the counters need the previous version,
+        so the pre-image is returned and the update, which only replaces
+        top-level fields, is applied to it here.
+        """
         data['updated_at'] = datetime.utcnow()
+        if 'company' in data:
+            data['company'] = with_name_key(data['company'])
 
-        result = self.collection.update_one(
+        tracked = any(field in data for field in TRACKED_FIELDS)
+        app = self.collection.find_one_and_update(
             {'_id': ObjectId(application_id), 'user_id': user_id},
-            {'$set': data}
+            {'$set': data},
+            return_document=ReturnDocument.BEFORE if tracked else ReturnDocument.AFTER
         )
 
-        if result.modified_count > 0:
-            return self.get_application(application_id, user_id)
-        return None
+        if app and tracked:
+            old_app, app = app, {**app, **data}
+            self._record_changes(user_id, added=[app], removed=[old_app])
+        return app
 
     def delete_application(self, application_id, user_id):
         """Delete an application."""
-        result = self.collection.delete_one({
+        app = self.collection.find_one_and_delete({
             '_id': ObjectId(application_id),
             'user_id': user_id
         })
-        return result.deleted_count > 0
+
+        if app:
+            self._record_changes(user_id, removed=[app])
+        return app is not None
 
     def add_timeline_event(self, application_id, user_id, event_data):
         """Add a timeline event to an application."""
@@ -116,40 +282,303 @@ class ApplicationService:
             }
         )
 
-        return result.modified_count > 0
+        if result.modified_count > 0:
+            self.rollup_service.record_timeline_events(user_id, [event])
+            return True
+        return False
 
-    def update_status(self, application_id, user_id, new_status, notes=None):
-        """Update application status and add timeline event."""
-        # Get current application
-        app = self.get_application(application_id, user_id)
-        if not app:
+    def remove_attachment(self, application_id, user_id, attachment_id):
+        """
+        Remove an attachment with a single $pull by attachment_id.
+
+        Returns the removed attachment, or None if the application or the
+        attachment does not exist.
+        """
+        app = self.collection.find_one_and_update(
+            {
+                '_id': ObjectId(application_id),
+                'user_id': user_id,
+                'attachments.attachment_id': attachment_id
+            },
+            {
+                '$pull': {'attachments': {'attachment_id': attachment_id}},
+                '$set': {'updated_at': datetime.utcnow()}
+            },
+            projection={'attachments': {'$elemMatch': {'attachment_id': attachment_id}}}
+        )
+        return app['attachments'][0] if app else None
+
+    def remove_attachment_at(self, application_id, user_id, index):
+        """
+        Remove the attachment at a position in the attachments array.
+
+        Kept for the index based endpoint. The position only picks the
+        attachment; it is removed by attachment_id, or by file_path for
+        attachments created before ids existed.
+        """
+        if index < 0:
             return None
 
-        old_status = app.get('application', {}).get('status', 'unknown')
+        app = self.collection.find_one(
+            {'_id': ObjectId(application_id), 'user_id': user_id},
+            {'attachments': {'$slice': [index, 1]}}
+        )
+        if not app or not app.get('attachments'):
+            return None
+
+        attachment = app['attachments'][0]
+        if attachment.get('attachment_id'):
+            return self.remove_attachment(
+                application_id, user_id, attachment['attachment_id'])
+
+        # Without a file_path there is nothing identifying the element;
+        # pulling on a null file_path would remove every such attachment
+        if not attachment.get('file_path'):
+            return None
+
+        result = self.collection.update_one(
+            {'_id': app['_id'], 'user_id': user_id},
+            {
+                '$pull': {'attachments': {'file_path': attachment['file_path']}},
+                '$set': {'updated_at': datetime.utcnow()}
+            }
+        )
+        return attachment if result.modified_count else None
+
+    def backfill_attachment_ids(self, batch_size=1000):
+        """
+        Give an attachment_id to attachments created before it existed.
+
+        Each update only applies if the attachments array is unchanged since
+        it was read, so a concurrent attach is never overwritten; skipped
+        applications are picked up by running the backfill again. Returns
+        the number of applications updated.
+        """
+        updated = 0
+        operations = []
+        applications = self.collection.find(
+            {'attachments': {'$elemMatch': {'attachment_id': {'$exists': False}}}},
+            {'attachments': 1}
+        )
+        for app in applications:
+            attachments = [
+                attachment if attachment.get('attachment_id')
+                else {**attachment, 'attachment_id': new_attachment_id()}
+                for attachment in app['attachments']
+            ]
+            operations.append(UpdateOne(
+                {'_id': app['_id'], 'attachments': app['attachments']},
+                {'$set': {'attachments': attachments}}
+            ))
+            if len(operations) >= batch_size:
+                updated += self.collection.bulk_write(
+                    operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += self.collection.bulk_write(
+                operations, ordered=False).modified_count
+        return updated
+
+    def update_status(self, application_id, user_id, new_status, notes=None):
+        """
+        Update application status and add timeline event.
 
-        # Create timeline event
+        One pipeline update sets the status and appends the event, whose
+        title and previous_status are read from the document being updated.
+        """
         event = {
             'date': datetime.utcnow(),
             'event_type': 'status_change',
-            'title': f'Status changed from {old_status} to {new_status}',
-            'notes': notes or '',
+            'title': {'$concat': [
+                'Status changed from ',
+                {'$ifNull': ['$application.status', 'unknown']},
+                ' to ',
+                {'$literal': new_status}
+            ]},
+            'previous_status': '$application.status',
+            'notes': {'$literal': notes or ''},
         }
 
-        # Update status and add timeline event
-        result = self.collection.update_one(
+        app = self.collection.find_one_and_update(
             {'_id': ObjectId(application_id), 'user_id': user_id},
-            {
-                '$set': {
-                    'application.status': new_status,
-                    'updated_at': datetime.utcnow()
+            [{'$set': {
+                'timeline': {'$concatArrays': [
+                    {'$ifNull': ['$timeline', []]}, [event]
+                ]},
+                'application.status': {'$literal': new_status},
+                'updated_at': datetime.utcnow()
+            }}],
+            return_document=ReturnDocument.AFTER
+        )
+
+        if app:
+            *timeline, event = app['timeline']
+            old_app = {
+                **app,
+                'application': {
+                    **app['application'],
+                    'status': event.get('previous_status')
                 },
-                '$push': {'timeline': event}
+                'timeline': timeline
             }
-        )
+            self._record_changes(user_id, added=[app], removed=[old_app])
+        return app
 
-        if result.modified_count > 0:
-            return self.get_application(application_id, user_id)
-        return None
+    def bulk_update_status(self, user_id, new_status, ids=None, filters=None,
+                           notes=None):
+        """
+        Change the status of many applications and add a timeline event.
+
+        Applications are selected by ``ids`` or by list ``filters``; those
+        already in ``new_status`` are left alone. Selections are processed
+        in batches of BULK_APPLICATIONS_MAX: each batch is read once, then
+        updated with one bulk write holding an UpdateMany per previous
+        status, so each timeline event names its old status.
+        """
+        query = {'$and': [
+            self._bulk_query(user_id, ids, filters),
+            {'application.status': {'$ne': new_status}}
+        ]}
+
+        matched_count = modified_count = 0
+        for old_apps in self._bulk_batches(query):
+            result = self._update_status_batch(
+                user_id, new_status, notes, old_apps)
+            matched_count += result.matched_count
+            modified_count += result.modified_count
+
+        return {
+            'matched_count': matched_count,
+            'modified_count': modified_count
+        }
+
+    def _update_status_batch(self, user_id, new_status, notes, old_apps):
+        """Apply a status change to one batch read by bulk_update_status."""
+        now = datetime.utcnow()
+        by_status = defaultdict(list)
+        for app in old_apps:
+            by_status[app.get('application', {}).get('status')].append(app)
+
+        operations = []
+        events = {}
+        for old_status, apps in by_status.items():
+            events[old_status] = {
+                'date': now,
+                'event_type': 'status_change',
+                'title': f"Status changed from {old_status or 'unknown'} to {new_status}",
+                'previous_status': old_status,
+                'notes': notes or '',
+            }
+            operations.append(UpdateMany(
+                {
+                    '_id': {'$in': [app['_id'] for app in apps]},
+                    'user_id': user_id,
+                    'application.status': old_status
+                },
+                {
+                    '$set': {
+                        'application.status': new_status,
+                        'updated_at': now
+                    },
+                    '$push': {'timeline': events[old_status]}
+                }
+            ))
+
+        result = self.collection.bulk_write(operations, ordered=False)
+
+        if result.modified_count < len(old_apps):
+            # Some changed status since they were read; only count the
+            # ones this write updated, recognised by their updated_at
+            updated = {
+                app['_id'] for app in self.collection.find(
+                    {
+                        '_id': {'$in': [app['_id'] for app in old_apps]},
+                        'updated_at': now
+                    },
+                    {'_id': 1}
+                )
+            }
+            old_apps = [app for app in old_apps if app['_id'] in updated]
+
+        new_apps = []
+        for app in old_apps:
+            old_status = app.get('application', {}).get('status')
+            new_apps.append({
+                **app,
+                'application': {**app.get('application', {}), 'status': new_status},
+                'timeline': [*app.get('timeline', []), events[old_status]],
+            })
+        self._record_changes(user_id, added=new_apps, removed=old_apps)
+
+        return result
+
+    def bulk_delete(self, user_id, ids=None, filters=None):
+        """
+        Delete applications selected by ``ids`` or list ``filters``.
+
+        Selections are deleted in batches of BULK_APPLICATIONS_MAX. If a
+        batch deletes fewer documents than it read, another request removed
+        some of them first and it is not known which, so the user's counters
+        and rollup are rebuilt instead of adjusted.
+        """
+        query = self._bulk_query(user_id, ids, filters)
+
+        deleted_count = 0
+        rebuild = False
+        for apps in self._bulk_batches(query):
+            result = self.collection.delete_many({
+                '_id': {'$in': [app['_id'] for app in apps]},
+                'user_id': user_id
+            })
+            deleted_count += result.deleted_count
+            if result.deleted_count == len(apps):
+                self._record_changes(user_id, removed=apps)
+            else:
+                rebuild = True
+
+        if rebuild:
+            self.company_service.rebuild_application_counters(user_id=user_id)
+            self.rollup_service.rebuild(user_id)
+        return deleted_count
+
+    def _bulk_batches(self, query):
+        """
+        Yield the documents matching ``query`` in _id order, at most
+        BULK_APPLICATIONS_MAX at a time.
+        """
+        batch_size = settings.BULK_APPLICATIONS_MAX
+        last_id = None
+        while True:
+            batch_query = query
+            if last_id is not None:
+                batch_query = {'$and': [query, {'_id': {'$gt': last_id}}]}
+
+            apps = list(
+                self.collection.find(batch_query, CHANGES_PROJECTION)
+                .sort('_id', 1)
+                .limit(batch_size)
+            )
+            if apps:
+                yield apps
+            if len(apps) < batch_size:
+                return
+            last_id = apps[-1]['_id']
+
+    def _bulk_query(self, user_id, ids=None, filters=None):
+        """Query selecting applications for a bulk operation."""
+        if ids is not None:
+            return {
+                'user_id': user_id,
+                '_id': {'$in': [ObjectId(app_id) for app_id in ids]}
+            }
+        return self._build_query(user_id, filters)
+
+    def _record_changes(self, user_id, added=(), removed=()):
+        """Propagate application writes to company counters and analytics."""
+        self.company_service.apply_application_changes(
+            user_id, added=added, removed=removed)
+        self.rollup_service.apply_changes(
+            user_id, added=added, removed=removed)
 
     def get_statistics(self, user_id):
         """Get application statistics for a user."""
@@ -172,15 +601,65 @@ class ApplicationService:
             'status_breakdown': status_counts
         }
 
-    def search_applications(self, user_id, search_term):
-        """Search applications by company name, job title, or notes."""
+    def search_applications(self, user_id, search_term, projection=None,
+                            skip=0, limit=20, mode='auto'):
+        """
+        Search applications by company name, job title, or notes.
+
+        ``mode`` 'text' uses the user_text index and ranks by text score;
+        'prefix' matches company names and job titles starting with the term
+        (partial words, which $text does not match); 'auto' runs the text
+        search and falls back to prefix when it finds nothing.
+        Returns the total, one page of applications and the mode used.
+        """
+        if mode != 'prefix':
+            try:
+                result = self._text_search(
+                    user_id, search_term, projection, skip, limit)
+            except OperationFailure as exc:
+                if mode == 'text' or exc.code != INDEX_NOT_FOUND:
+                    raise
+                result = None
+
+            if mode == 'text' or (result and result['total']):
+                return result
+
+        return self._prefix_search(user_id, search_term, projection, skip, limit)
+
+    def _text_search(self, user_id, search_term, projection, skip, limit):
+        """Ranked $text search on the user_text index."""
+        query = {'user_id': user_id, '$text': {'$search': search_term}}
+        score = {'$meta': 'textScore'}
+
+        total = self.collection.count_documents(query)
+        applications = []
+        if total > skip:
+            applications = list(
+                self.collection.find(query, {**(projection or {}), 'score': score})
+                .sort([('score', score), ('created_at', -1)])
+                .skip(skip)
+                .limit(limit)
+            )
+
+        return {'total': total, 'applications': applications, 'mode': 'text'}
+
+    def _prefix_search(self, user_id, search_term, projection, skip, limit):
+        """Case-insensitive prefix match on company name and job title."""
+        pattern = {'$regex': '^' + re.escape(search_term), '$options': 'i'}
         query = {
             'user_id': user_id,
             '$or': [
-                {'company.name': {'$regex': search_term, '$options': 'i'}},
-                {'job.title': {'$regex': search_term, '$options': 'i'}},
-                {'notes': {'$regex': search_term, '$options': 'i'}},
+                {'company.name': pattern},
+                {'job.title': pattern},
             ]
         }
 
-        return list(self.collection.find(query).sort('created_at', -1))
+        total = self.collection.count_documents(query)
+        applications = list(
+            self.collection.find(query, projection)
+            .sort('created_at', -1)
+            .skip(skip)
+            .limit(limit)
+        )
+
+        return {'total': total, 'applications': applications, 'mode': 'prefix'}
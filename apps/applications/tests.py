@@ -1,3 +1,205 @@
-from django.test import TestCase
+import base64
+import gc
+import weakref
+from datetime import datetime
+from unittest import mock
 
-# Create your tests here.
+import mongomock
+from bson import ObjectId
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from config import serialization
+
+from .serializers import ApplicationSerializer
+from .services import ApplicationService, decode_cursor, encode_cursor
+
+
+class ApplicationServiceTests(SimpleTestCase):
+    """ApplicationService writes against an in-memory MongoDB."""
+
+    def setUp(self):
+        db = mongomock.MongoClient()['job_tracker']
+        for module in ('apps.applications.services',
+                       'apps.companies.services',
+                       'apps.analytics.rollup'):
+            patcher = mock.patch(f'{module}.get_collection',
+                                 side_effect=lambda name: db[name])
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.db = db
+        self.service = ApplicationService()
+        for name, status in (('Acme', 'applied'), ('Beta', 'interview'),
+                             ('Gamma', 'offer'), ('Delta', 'applied')):
+            self.service.create_application(1, {
+                'company': {'name': name},
+                'job': {'title': 'Engineer'},
+                'application': {'status': status},
+            })
+        self.service.create_application(2, {
+            'company': {'name': 'Acme'},
+            'job': {'title': 'Engineer'},
+            'application': {'status': 'applied'},
+        })
+
+    def test_legacy_attachment_without_file_path_is_not_removed(self):
+        app = self.db.applications.find_one({'company.name': 'Acme'})
+        attachments = [{'filename': 'a.pdf'}, {'filename': 'b.pdf'},
+                       {'filename': 'c.pdf', 'file_path': 'uploads/c.pdf'}]
+        self.db.applications.update_one(
+            {'_id': app['_id']}, {'$set': {'attachments': attachments}})
+
+        self.assertIsNone(
+            self.service.remove_attachment_at(str(app['_id']), 1, 0))
+        removed = self.service.remove_attachment_at(str(app['_id']), 1, 2)
+
+        self.assertEqual(removed['file_path'], 'uploads/c.pdf')
+        app = self.db.applications.find_one({'_id': app['_id']})
+        self.assertEqual(app['attachments'], attachments[:2])
+
+    def statuses(self, user_id=1):
+        return sorted(
+            (app['company']['name'], app['application']['status'])
+            for app in self.db.applications.find({'user_id': user_id})
+        )
+
+    def test_status_filter_selects_only_that_status(self):
+        result = self.service.bulk_update_status(
+            1, 'withdrawn', filters={'status': 'applied'})
+
+        self.assertEqual(result, {'matched_count': 2, 'modified_count': 2})
+        self.assertEqual(self.statuses(), [
+            ('Acme', 'withdrawn'), ('Beta', 'interview'),
+            ('Delta', 'withdrawn'), ('Gamma', 'offer'),
+        ])
+        self.assertEqual(self.statuses(user_id=2), [('Acme', 'applied')])
+
+    def test_status_change_skips_applications_already_in_status(self):
+        result = self.service.bulk_update_status(
+            1, 'offer', filters={'company': 'a'})
+
+        self.assertEqual(result['modified_count'], 3)
+        gamma = self.db.applications.find_one({'company.name': 'Gamma'})
+        self.assertEqual(gamma['timeline'], [])
+
+    @override_settings(BULK_APPLICATIONS_MAX=3)
+    def test_filter_selection_is_processed_in_batches(self):
+        result = self.service.bulk_update_status(
+            1, 'rejected', filters={'company': 'a'})
+
+        self.assertEqual(result['modified_count'], 4)
+        self.assertEqual(
+            {status for _, status in self.statuses()}, {'rejected'})
+
+    @override_settings(BULK_APPLICATIONS_MAX=1)
+    def test_delete_by_filter(self):
+        deleted = self.service.bulk_delete(1, filters={'status': 'applied'})
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.statuses(), [
+            ('Beta', 'interview'), ('Gamma', 'offer'),
+        ])
+        self.assertEqual(self.statuses(user_id=2), [('Acme', 'applied')])
+
+
+class CompiledSerializerTests(SimpleTestCase):
+    """Output of ApplicationSerializer through config.serialization."""
+
+    def make_page(self):
+        class Page(list):
+            pass
+
+        return Page({
+            '_id': ObjectId(),
+            'user_id': 1,
+            'company': {'name': f'Company {i}'},
+            'job': {'title': 'Engineer'},
+            'application': {'status': 'applied'},
+            'created_at': datetime(2025, 1, i + 1),
+            'updated_at': datetime(2025, 1, i + 1),
+        } for i in range(3))
+
+    def test_compiled_output_does_not_keep_the_page_alive(self):
+        page = self.make_page()
+        ref = weakref.ref(page)
+
+        data = ApplicationSerializer(
+            page, many=True, fields=['id', 'company.name']).data
+        self.assertEqual(data[0]['company'], {'name': 'Company 0'})
+
+        del page, data
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_field_combinations_do_not_grow_the_cache(self):
+        page = self.make_page()
+        fields = ['company.name', 'job.title', 'application.status',
+                  'user_id', 'created_at', 'updated_at', 'notes']
+
+        for mask in range(1, 2 ** len(fields)):
+            selected = [
+                field for i, field in enumerate(fields) if mask & (1 << i)]
+            ApplicationSerializer(page, many=True, fields=selected).data
+
+        self.assertLessEqual(
+            len(serialization._compiled), serialization.COMPILED_CACHE_SIZE)
+
+
+class CursorTests(SimpleTestCase):
+    """Opaque keyset pagination cursors."""
+
+    def test_round_trip(self):
+        app = {'_id': ObjectId(), 'created_at': datetime(2025, 1, 2, 3, 4, 5)}
+        self.assertEqual(decode_cursor(encode_cursor(app)),
+                         (app['created_at'], app['_id']))
+
+    def test_out_of_range_timestamp_is_invalid(self):
+        payload = '{"c": 100000000000000000000, "i": "%s"}' % ObjectId()
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+
+        with self.assertRaisesMessage(ValueError, 'Invalid cursor'):
+            decode_cursor(cursor)
+
+
+class SearchViewTests(SimpleTestCase):
+    """Paging parameters of GET /api/applications/search/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User(id=1, email='user@example.com'))
+
+    def test_invalid_page_parameters_are_rejected(self):
+        for params in ({'page': 'x'}, {'page_size': 'x'}, {'page': 0},
+                       {'page': -1}):
+            response = self.client.get(
+                '/api/applications/search/', {'q': 'acme', **params})
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_page_size_is_clamped(self):
+        with mock.patch('apps.applications.views.ApplicationService') as service:
+            service.return_value.search_applications.return_value = {
+                'total': 0, 'applications': [], 'mode': 'text'}
+
+            for page_size, limit in (('0', 1), ('500', 100), ('10', 10)):
+                self.client.get('/api/applications/search/',
+                                {'q': 'acme', 'page_size': page_size})
+                kwargs = service.return_value.search_applications.call_args.kwargs
+                self.assertEqual(kwargs['limit'], limit)
+
+
+class BulkCreateViewTests(SimpleTestCase):
+    """Request validation of POST /api/applications/bulk/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User(id=1, email='user@example.com'))
+
+    def test_empty_list_is_rejected(self):
+        response = self.client.post(
+            '/api/applications/bulk/', [], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'error': 'Expected at least one application'})
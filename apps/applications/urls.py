@@ -12,6 +12,13 @@ urlpatterns = [
     path('stats/', views.application_statistics, name='application_statistics'),
     path('search/', views.search_applications, name='search_applications'),
 
+    # Batch operations (must come before <str:pk>)
+    path('bulk/', views.bulk_create_applications,
+         name='bulk_create_applications'),
+    path('bulk/status/', views.bulk_update_status, name='bulk_update_status'),
+    path('bulk/delete/', views.bulk_delete_applications,
+         name='bulk_delete_applications'),
+
     # File uploads
     path('upload/', views.FileUploadView.as_view(), name='file_upload'),
     path('upload-resume/', views.upload_resume, name='upload_resume'),
@@ -29,5 +36,7 @@ urlpatterns = [
     # File attachments
     path('<str:pk>/attach/', views.attach_file_to_application, name='attach_file'),
     path('<str:pk>/attachments/<int:attachment_index>/',
+         views.delete_attachment_at, name='delete_attachment_at'),
+    path('<str:pk>/attachments/<str:attachment_id>/',
          views.delete_attachment, name='delete_attachment'),
 ]
@@ -7,19 +7,28 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from bson.errors import InvalidId
 from bson import ObjectId
 from datetime import datetime
+from django.conf import settings
 
-from .services import ApplicationService
+from .services import ApplicationService, SEARCH_MODES
 from .file_service import FileUploadService
 from .serializers import (
     ApplicationSerializer,
     ApplicationCreateSerializer,
     ApplicationUpdateSerializer,
     StatusUpdateSerializer,
+    BulkSelectionSerializer,
+    BulkStatusUpdateSerializer,
     TimelineEventSerializer,
-    ApplicationStatisticsSerializer
+    ApplicationStatisticsSerializer,
+    parse_fields,
+    fields_projection
 )
 
 
+# Largest page_size accepted by the search endpoint
+MAX_SEARCH_PAGE_SIZE = 100
+
+
 class ApplicationListCreateView(APIView):
     """
     GET  /api/applications/  - List all applications
@@ -28,9 +37,30 @@ class ApplicationListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        """List all applications for current user."""
+        """
+        List all applications for current user.
+
+        Pages by ``page`` number by default. Pass ``pagination=cursor`` (or a
+        ``cursor`` from a previous response) for keyset pagination, which
+        returns ``next_cursor`` and only counts when ``include_count=true``.
+
+        ``fields`` limits the output (and the fields read from MongoDB) to a
+        comma separated list of paths such as ``id,company.name,job.title``,
+        or the ``summary`` preset.
+        """
         service = ApplicationService()
 
+        fields = projection = None
+        if request.GET.get('fields'):
+            try:
+                fields = parse_fields(request.GET['fields'])
+            except ValueError as e:
+                return Response(
+                    {'error': str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            projection = fields_projection(fields)
+
         # Get query parameters
         page = int(request.GET.get('page', 1))
         page_size = int(request.GET.get('page_size', 20))
@@ -48,14 +78,42 @@ class ApplicationListCreateView(APIView):
             filters['is_favorite'] = request.GET.get(
                 'is_favorite').lower() == 'true'
 
+        if request.GET.get('pagination') == 'cursor' or request.GET.get('cursor'):
+            try:
+                result = service.get_applications_after(
+                    user_id=request.user.id,
+                    filters=filters,
+                    cursor=request.GET.get('cursor'),
+                    limit=page_size,
+                    include_count=request.GET.get(
+                        'include_count', '').lower() == 'true',
+                    projection=projection
+                )
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid cursor'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            serializer = ApplicationSerializer(
+                result['applications'], many=True, fields=fields)
+
+            return Response({
+                'count': result['total'],
+                'next_cursor': result['next_cursor'],
+                'results': serializer.data
+            })
+
         result = service.get_applications(
             user_id=request.user.id,
             filters=filters,
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            projection=projection
         )
 
-        serializer = ApplicationSerializer(result['applications'], many=True)
+        serializer = ApplicationSerializer(
+            result['applications'], many=True, fields=fields)
 
         return Response({
             'count': result['total'],
@@ -167,6 +225,113 @@ class ApplicationDetailView(APIView):
             )
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_applications(request):
+    """
+    POST /api/applications/bulk/
+    Create a list of applications in one batch.
+
+    Items are validated together; if any is invalid nothing is written and
+    the errors are returned per item index. Valid batches are written with
+    one unordered insert, so a failed row does not stop the others.
+    """
+    if not isinstance(request.data, list):
+        return Response(
+            {'error': 'Expected a list of applications'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not request.data:
+        return Response(
+            {'error': 'Expected at least one application'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(request.data) > settings.BULK_APPLICATIONS_MAX:
+        return Response(
+            {'error': f'At most {settings.BULK_APPLICATIONS_MAX} applications per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    serializer = ApplicationCreateSerializer(data=request.data, many=True)
+
+    if not serializer.is_valid():
+        return Response(
+            {'errors': [
+                {'index': index, 'errors': errors}
+                for index, errors in enumerate(serializer.errors) if errors
+            ]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    service = ApplicationService()
+    result = service.create_applications(
+        request.user.id, serializer.validated_data)
+
+    failed = {error['index'] for error in result['errors']}
+    created_ids = iter(str(app['_id']) for app in result['applications'])
+    created = [
+        {'index': index, 'id': next(created_ids)}
+        for index in range(len(serializer.validated_data))
+        if index not in failed
+    ]
+
+    return Response(
+        {
+            'created_count': len(created),
+            'error_count': len(result['errors']),
+            'created': created,
+            'errors': result['errors']
+        },
+        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+    )
+
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def bulk_update_status(request):
+    """
+    PATCH /api/applications/bulk/status/
+    Change the status of applications selected by ``ids`` or ``filter``.
+    """
+    serializer = BulkStatusUpdateSerializer(data=request.data)
+
+    if serializer.is_valid():
+        service = ApplicationService()
+        result = service.bulk_update_status(
+            request.user.id,
+            serializer.validated_data['status'],
+            ids=serializer.validated_data.get('ids'),
+            filters=serializer.validated_data.get('filter'),
+            notes=serializer.validated_data.get('notes')
+        )
+        return Response(result)
+
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_delete_applications(request):
+    """
+    POST /api/applications/bulk/delete/
+    Delete applications selected by ``ids`` or ``filter``.
+    """
+    serializer = BulkSelectionSerializer(data=request.data)
+
+    if serializer.is_valid():
+        service = ApplicationService()
+        deleted_count = service.bulk_delete(
+            request.user.id,
+            ids=serializer.validated_data.get('ids'),
+            filters=serializer.validated_data.get('filter')
+        )
+        return Response({'deleted_count': deleted_count})
+
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_timeline_event(request, pk):
@@ -260,10 +425,29 @@ def application_statistics(request):
 @permission_classes([IsAuthenticated])
 def search_applications(request):
     """
-    GET /api/applications/search/?q=term
-    Search applications by company, job title, or notes.
+    GET /api/applications/search/?q=term[&mode=auto|text|prefix][&fields=summary]
+    Search applications by company, job title, or notes, best matches first.
     """
     search_term = request.GET.get('q', '')
+    mode = request.GET.get('mode', 'auto')
+
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', 20))
+    except ValueError:
+        return Response(
+            {'error': 'page and page_size must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if page < 1:
+        return Response(
+            {'error': 'page must be at least 1'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    page_size = min(max(page_size, 1), MAX_SEARCH_PAGE_SIZE)
+    skip = (page - 1) * page_size
 
     if not search_term:
         return Response(
@@ -271,11 +455,43 @@ def search_applications(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    if mode not in SEARCH_MODES:
+        return Response(
+            {'error': f"Mode must be one of: {', '.join(SEARCH_MODES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    fields = projection = None
+    if request.GET.get('fields'):
+        try:
+            fields = parse_fields(request.GET['fields'])
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        projection = fields_projection(fields)
+
     service = ApplicationService()
-    applications = service.search_applications(request.user.id, search_term)
+    result = service.search_applications(
+        request.user.id,
+        search_term,
+        projection=projection,
+        skip=skip,
+        limit=page_size,
+        mode=mode
+    )
 
-    serializer = ApplicationSerializer(applications, many=True)
-    return Response(serializer.data)
+    serializer = ApplicationSerializer(
+        result['applications'], many=True, fields=fields)
+
+    return Response({
+        'count': result['total'],
+        'mode': result['mode'],
+        'next': page + 1 if skip + page_size < result['total'] else None,
+        'previous': page - 1 if page > 1 else None,
+        'results': serializer.data
+    })
 
 
 class FileUploadView(APIView):
@@ -376,60 +592,67 @@ def attach_file_to_application(request, pk):
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
-def delete_attachment(request, pk, attachment_index):
+def delete_attachment(request, pk, attachment_id):
     """
-    DELETE /api/applications/{id}/attachments/{index}/
+    DELETE /api/applications/{id}/attachments/{attachment_id}/
     Delete an attachment from application.
     """
     try:
         service = ApplicationService()
-        application = service.get_application(pk, request.user.id)
+        attachment = service.remove_attachment(
+            pk, request.user.id, attachment_id)
 
-        if not application:
+        if not attachment:
             return Response(
-                {'error': 'Application not found'},
+                {'error': 'Attachment not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        attachments = application.get('attachments', [])
-        attachment_index = int(attachment_index)
+        if attachment.get('file_path'):
+            FileUploadService.delete_file(attachment['file_path'])
 
-        if attachment_index < 0 or attachment_index >= len(attachments):
-            return Response(
-                {'error': 'Invalid attachment index'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response(
+            {'message': 'Attachment deleted successfully'},
+            status=status.HTTP_204_NO_CONTENT
+        )
 
-        # Get file path and delete file
-        file_path = attachments[attachment_index].get('file_path')
-        if file_path:
-            FileUploadService.delete_file(file_path)
+    except InvalidId:
+        return Response(
+            {'error': 'Invalid application ID'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-        # Remove from attachments array
-        from config.mongodb import get_collection
-        collection = get_collection('applications')
 
-        # Remove by index
-        attachments.pop(attachment_index)
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_attachment_at(request, pk, attachment_index):
+    """
+    DELETE /api/applications/{id}/attachments/{index}/
+    Delete an attachment by position. Prefer the attachment_id endpoint;
+    positions shift when other attachments are removed.
+    """
+    try:
+        service = ApplicationService()
+        attachment = service.remove_attachment_at(
+            pk, request.user.id, attachment_index)
+
+        if not attachment:
+            return Response(
+                {'error': 'Attachment not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        result = collection.update_one(
-            {'_id': ObjectId(pk), 'user_id': request.user.id},
-            {
-                '$set': {
-                    'attachments': attachments,
-                    'updated_at': datetime.utcnow()
-                }
-            }
-        )
+        if attachment.get('file_path'):
+            FileUploadService.delete_file(attachment['file_path'])
 
         return Response(
             {'message': 'Attachment deleted successfully'},
             status=status.HTTP_204_NO_CONTENT
         )
 
-    except (InvalidId, ValueError):
+    except InvalidId:
         return Response(
-            {'error': 'Invalid ID'},
+            {'error': 'Invalid application ID'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
@@ -0,0 +1,106 @@
+"""
+In-process company name autocomplete index.
+
+Each user's company name keys are loaded once into a sorted array and
+answered with bisect, so autocomplete does not query MongoDB per keystroke.
+Users are kept in an LRU bounded by COMPANY_AUTOCOMPLETE_CACHE_USERS.
+CompanyService invalidates a user's entry on every write; the TTL bounds
+staleness from writes made by other processes.
+"""
+
+import bisect
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .utils import company_name_key
+
+
+class _UserIndex:
+    """Sorted normalized names of one user's companies."""
+
+    def __init__(self, companies):
+        # Never compare the company dicts: duplicate names are possible
+        # when the unique name_key index is not in place
+        entries = sorted(
+            ((company.get('name_key') or company_name_key(company.get('name')),
+              company.get('name') or '', company)
+             for company in companies),
+            key=lambda entry: entry[:2]
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.companies = [company for _, _, company in entries]
+
+    def search(self, prefix, limit):
+        start = bisect.bisect_left(self.keys, prefix)
+        results = []
+        for position in range(start, len(self.keys)):
+            if len(results) >= limit or not self.keys[position].startswith(prefix):
+                break
+            results.append(self.companies[position])
+        return results
+
+
+class CompanyNameIndex:
+    """LRU of per-user autocomplete indexes."""
+
+    def __init__(self, max_users=1000, ttl=300):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation so an index loaded concurrently with a
+        # write is not cached
+        self._generation = 0
+
+    def search(self, collection, user_id, prefix, limit=10):
+        """Companies whose normalized name starts with ``prefix``."""
+        index = self._get(user_id)
+        if index is None:
+            generation = self._generation
+            companies = collection.find(
+                {'user_id': user_id},
+                {'name': 1, 'name_key': 1, 'industry': 1, 'location': 1})
+            index = _UserIndex(companies)
+            self._put(user_id, index, generation)
+        return index.search(company_name_key(prefix), limit)
+
+    def invalidate(self, user_id):
+        """Drop a user's index; it is reloaded on the next search."""
+        with self._lock:
+            self._generation += 1
+            self._indexes.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._indexes.clear()
+
+    def _get(self, user_id):
+        with self._lock:
+            entry = self._indexes.get(user_id)
+            if entry is None:
+                return None
+            loaded_at, index = entry
+            if time.monotonic() - loaded_at > self.ttl:
+                del self._indexes[user_id]
+                return None
+            self._indexes.move_to_end(user_id)
+            return index
+
+    def _put(self, user_id, index, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._indexes[user_id] = (time.monotonic(), index)
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+
+
+company_name_index = CompanyNameIndex(
+    max_users=getattr(settings, 'COMPANY_AUTOCOMPLETE_CACHE_USERS', 1000),
+    ttl=getattr(settings, 'COMPANY_AUTOCOMPLETE_TTL', 300)
+)
@@ -0,0 +1,54 @@
+"""
+Backfill normalized company name keys and switch to the name_key indexes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.companies.services import CompanyService
+from config.indexes import drop_superseded_indexes, ensure_indexes
+
+
+class Command(BaseCommand):
+    help = ('Set name_key on companies and applications, recompute company '
+            'counters and create the name_key indexes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of updates sent per bulk write.'
+        )
+
+    def handle(self, *args, **options):
+        service = CompanyService()
+        result = service.backfill_name_keys(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Set name_key on {result['companies']} companies and "
+            f"{result['applications']} applications"))
+
+        updated = service.rebuild_application_counters(
+            batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt application counters for {updated} companies'))
+
+        if result['duplicates']:
+            for user_id, name_key in result['duplicates']:
+                self.stdout.write(self.style.ERROR(
+                    f'  duplicate   user {user_id}: {name_key!r}'))
+            raise CommandError(
+                'Merge or rename the duplicate companies above, then run '
+                'this command again to create the unique name_key index')
+
+        report = ensure_indexes()
+        for collection_name, entry in report.items():
+            for name in entry['created']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Created index {collection_name}.{name}'))
+            for name, error in entry['failed'].items():
+                raise CommandError(
+                    f'Could not create index {collection_name}.{name}: {error}')
+
+        for name in drop_superseded_indexes():
+            self.stdout.write(self.style.SUCCESS(f'Dropped index {name}'))
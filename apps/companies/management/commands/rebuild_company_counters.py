@@ -0,0 +1,34 @@
+"""
+Rebuild the application counters stored on company documents.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.companies.services import CompanyService
+
+
+class Command(BaseCommand):
+    help = 'Recompute application_count and status_counts on companies from applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Only rebuild counters for this user.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of company updates sent per bulk write.'
+        )
+
+    def handle(self, *args, **options):
+        service = CompanyService()
+        updated = service.rebuild_application_counters(
+            user_id=options['user_id'],
+            batch_size=options['batch_size']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt application counters for {updated} companies'))
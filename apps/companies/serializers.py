@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from config.mongodb import decode_field_key
+
 
 class ContactInfoSerializer(serializers.Serializer):
     """Serializer for contact information."""
@@ -31,8 +33,9 @@ class CompanySerializer(serializers.Serializer):
     is_favorite = serializers.BooleanField(default=False)
     tags = serializers.ListField(child=serializers.CharField(), default=list)
     contact_info = ContactInfoSerializer(required=False)
-    application_count = serializers.IntegerField(
-        read_only=True, required=False)
+    application_count = serializers.IntegerField(read_only=True, default=0)
+    status_counts = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True, default=dict)
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -41,6 +44,12 @@ class CompanySerializer(serializers.Serializer):
         rep = super().to_representation(instance)
         if '_id' in instance:
             rep['id'] = str(instance['_id'])
+        if rep.get('status_counts'):
+            rep['status_counts'] = {
+                decode_field_key(key): count
+                for key, count in rep['status_counts'].items()
+                if count
+            }
         return rep
 
 
@@ -88,6 +97,8 @@ class CompanyStatsSerializer(serializers.Serializer):
     total_applications = serializers.IntegerField()
     status_breakdown = serializers.DictField()
     average_response_time = serializers.FloatField()
+    median_response_time = serializers.FloatField()
+    p90_response_time = serializers.FloatField()
 
 
 class IndustryBreakdownSerializer(serializers.Serializer):
@@ -3,8 +3,31 @@ Companies service layer for MongoDB operations.
 """
 
 from bson import ObjectId
+from collections import Counter, defaultdict
 from datetime import datetime
-from config.mongodb import get_collection
+from django.conf import settings
+from django.core.cache import cache
+from pymongo import UpdateMany, UpdateOne
+from config.mongodb import get_collection, encode_field_key
+from apps.analytics.services import response_days_stages
+from .autocomplete import company_name_index
+from .utils import company_name_key
+
+
+def company_stats_cache_key(company_id, user_id):
+    """Cache key of CompanyService.get_company_stats results."""
+    return f'company_stats:{user_id}:{company_id}'
+
+
+def _nearest_rank(sorted_array, percentile):
+    """Expression for the nearest-rank percentile of a sorted array."""
+    return {'$arrayElemAt': [
+        sorted_array,
+        {'$toInt': {'$subtract': [
+            {'$ceil': {'$multiply': [percentile, {'$size': sorted_array}]}},
+            1
+        ]}}
+    ]}
 
 
 class CompanyService:
@@ -16,9 +39,25 @@ class CompanyService:
 
     def create_company(self, user_id, data):
         """Create a new company."""
-        company = {
+        company = self._new_company(user_id, data)
+
+        # Applications may already exist for this company
+        counters = self._application_counters(
+            {'user_id': user_id, 'company.name_key': company['name_key']})
+        if (user_id, company['name_key']) in counters:
+            company.update(counters[(user_id, company['name_key'])])
+
+        result = self.collection.insert_one(company)
+        company['_id'] = result.inserted_id
+        company_name_index.invalidate(user_id)
+        return company
+
+    def _new_company(self, user_id, data):
+        """Build a new company document with empty counters."""
+        return {
             'user_id': user_id,
             'name': data.get('name'),
+            'name_key': company_name_key(data.get('name')),
             'website': data.get('website', ''),
             'industry': data.get('industry', ''),
             'size': data.get('size', ''),
@@ -30,14 +69,12 @@ class CompanyService:
             'is_favorite': data.get('is_favorite', False),
             'tags': data.get('tags', []),
             'contact_info': data.get('contact_info', {}),
+            'application_count': 0,
+            'status_counts': {},
             'created_at': datetime.utcnow(),
             'updated_at': datetime.utcnow(),
         }
 
-        result = self.collection.insert_one(company)
-        company['_id'] = result.inserted_id
-        return company
-
     def get_company(self, company_id, user_id):
         """Get a single company by ID."""
         return self.collection.find_one({
@@ -46,10 +83,10 @@ class CompanyService:
         })
 
     def get_company_by_name(self, name, user_id):
-        """Get company by name."""
+        """Get company by name, ignoring case and extra whitespace."""
         return self.collection.find_one({
-            'name': {'$regex': f'^{name}$', '$options': 'i'},
-            'user_id': user_id
+            'user_id': user_id,
+            'name_key': company_name_key(name)
         })
 
     def get_companies(self, user_id, filters=None, skip=0, limit=20):
@@ -76,14 +113,6 @@ class CompanyService:
             .limit(limit)
         )
 
-        # Add application count for each company
-        for company in companies:
-            app_count = self.applications_collection.count_documents({
-                'user_id': user_id,
-                'company.name': company['name']
-            })
-            company['application_count'] = app_count
-
         return {
             'total': total,
             'companies': companies
@@ -93,12 +122,24 @@ class CompanyService:
         """Update a company."""
         data['updated_at'] = datetime.utcnow()
 
+        # Counters follow the name, so recount when it changes
+        if data.get('name'):
+            data['name_key'] = company_name_key(data['name'])
+            counters = self._application_counters(
+                {'user_id': user_id, 'company.name_key': data['name_key']})
+            data.update(counters.get(
+                (user_id, data['name_key']),
+                {'application_count': 0, 'status_counts': {}}
+            ))
+
         result = self.collection.update_one(
             {'_id': ObjectId(company_id), 'user_id': user_id},
             {'$set': data}
         )
 
         if result.modified_count > 0:
+            company_name_index.invalidate(user_id)
+            cache.delete(company_stats_cache_key(company_id, user_id))
             return self.get_company(company_id, user_id)
         return None
 
@@ -108,7 +149,11 @@ class CompanyService:
             '_id': ObjectId(company_id),
             'user_id': user_id
         })
-        return result.deleted_count > 0
+        if result.deleted_count > 0:
+            company_name_index.invalidate(user_id)
+            cache.delete(company_stats_cache_key(company_id, user_id))
+            return True
+        return False
 
     def search_companies(self, user_id, search_term):
         """Search companies by name, industry, or location."""
@@ -123,31 +168,16 @@ class CompanyService:
 
         companies = list(self.collection.find(query).sort('name', 1))
 
-        # Add application count
-        for company in companies:
-            app_count = self.applications_collection.count_documents({
-                'user_id': user_id,
-                'company.name': company['name']
-            })
-            company['application_count'] = app_count
-
         return companies
 
     def autocomplete(self, user_id, prefix, limit=10):
-        """Autocomplete company names."""
-        query = {
-            'user_id': user_id,
-            'name': {'$regex': f'^{prefix}', '$options': 'i'}
-        }
-
-        companies = list(
-            self.collection.find(
-                query, {'name': 1, 'industry': 1, 'location': 1})
-            .sort('name', 1)
-            .limit(limit)
-        )
+        """
+        Autocomplete company names.
 
-        return companies
+        Matches are case and whitespace insensitive, ordered by normalized
+        name, and served from the in-process index (see autocomplete.py).
+        """
+        return company_name_index.search(self.collection, user_id, prefix, limit)
 
     def get_company_applications(self, company_id, user_id):
         """Get all applications for a specific company."""
@@ -158,7 +188,7 @@ class CompanyService:
         applications = list(
             self.applications_collection.find({
                 'user_id': user_id,
-                'company.name': company['name']
+                'company.name_key': company['name_key']
             }).sort('created_at', -1)
         )
 
@@ -168,90 +198,145 @@ class CompanyService:
         }
 
     def get_company_stats(self, company_id, user_id):
-        """Get statistics for a specific company."""
+        """
+        Get statistics for a specific company.
+
+        Total, status breakdown and response time average/median/p90
+        (nearest rank, in days) come from one $facet aggregation. Results
+        are cached for COMPANY_STATS_CACHE_TTL seconds per company.
+        """
+        cache_key = company_stats_cache_key(company_id, user_id)
+        stats = cache.get(cache_key)
+        if stats is not None:
+            return stats
+
         company = self.get_company(company_id, user_id)
         if not company:
             return None
 
-        # Total applications
-        total = self.applications_collection.count_documents({
-            'user_id': user_id,
-            'company.name': company['name']
-        })
-
-        # Status breakdown
         pipeline = [
             {'$match': {
                 'user_id': user_id,
-                'company.name': company['name']
+                'company.name_key': company['name_key']
             }},
-            {'$group': {
-                '_id': '$application.status',
-                'count': {'$sum': 1}
+            {'$facet': {
+                'status_breakdown': [
+                    {'$group': {
+                        '_id': '$application.status',
+                        'count': {'$sum': 1}
+                    }}
+                ],
+                'response_time': [
+                    *response_days_stages(),
+                    {'$sort': {'days': 1}},
+                    {'$group': {
+                        '_id': None,
+                        'average': {'$avg': '$days'},
+                        'days': {'$push': '$days'}
+                    }},
+                    {'$project': {
+                        '_id': 0,
+                        'average': 1,
+                        'median': _nearest_rank('$days', 0.5),
+                        'p90': _nearest_rank('$days', 0.9)
+                    }}
+                ]
             }}
         ]
 
-        status_breakdown = {}
-        for result in self.applications_collection.aggregate(pipeline):
-            status_breakdown[result['_id']] = result['count']
-
-        # Average response time
-        applications = list(self.applications_collection.find({
-            'user_id': user_id,
-            'company.name': company['name']
-        }, {'application.applied_date': 1, 'timeline': 1}))
-
-        response_times = []
-        for app in applications:
-            applied_date = app.get('application', {}).get('applied_date')
-            timeline = app.get('timeline', [])
-
-            if applied_date and timeline:
-                for event in sorted(timeline, key=lambda x: x.get('date', datetime.min)):
-                    event_date = event.get('date')
-                    if event_date and event_date > applied_date:
-                        days = (event_date - applied_date).days
-                        response_times.append(days)
-                        break
+        facets = next(self.applications_collection.aggregate(pipeline))
 
-        avg_response_time = sum(response_times) / \
-            len(response_times) if response_times else 0
+        status_breakdown = {
+            result['_id']: result['count']
+            for result in facets['status_breakdown']
+        }
+        response_time = (facets['response_time'] or [{}])[0]
 
-        return {
+        stats = {
             'company': company,
-            'total_applications': total,
+            'total_applications': sum(status_breakdown.values()),
             'status_breakdown': status_breakdown,
-            'average_response_time': round(avg_response_time, 1)
+            'average_response_time': round(response_time.get('average') or 0, 1),
+            'median_response_time': response_time.get('median') or 0,
+            'p90_response_time': response_time.get('p90') or 0
         }
 
-    def sync_companies_from_applications(self, user_id):
-        """Extract and create company entries from existing applications."""
-        # Get unique companies from applications
+        cache.set(cache_key, stats, settings.COMPANY_STATS_CACHE_TTL)
+        return stats
+
+    def sync_companies_from_applications(self, user_id, batch_size=1000):
+        """
+        Create companies for every company name used in applications and
+        refresh their application counters.
+
+        One aggregation collects each distinct company (by name_key) with its
+        counters, then unordered bulk upserts create missing companies from
+        the application's company info and set counters on existing ones.
+        Returns created, updated and unchanged counts.
+        """
         pipeline = [
-            {'$match': {'user_id': user_id}},
+            {'$match': {
+                'user_id': user_id,
+                'company.name_key': {'$type': 'string', '$ne': ''}
+            }},
+            {'$group': {
+                '_id': {
+                    'name_key': '$company.name_key',
+                    'status': '$application.status'
+                },
+                'company': {'$first': '$company'},
+                'count': {'$sum': 1}
+            }},
             {'$group': {
-                '_id': '$company.name',
-                'company': {'$first': '$company'}
+                '_id': '$_id.name_key',
+                'company': {'$first': '$company'},
+                'application_count': {'$sum': '$count'},
+                'statuses': {'$push': {'status': '$_id.status', 'count': '$count'}}
             }}
         ]
 
-        unique_companies = list(
-            self.applications_collection.aggregate(pipeline))
-
-        created_count = 0
-        for item in unique_companies:
-            company_name = item['_id']
-            company_data = item['company']
+        created = updated = matched = 0
+        operations = []
+
+        def flush():
+            nonlocal created, updated, matched
+            result = self.collection.bulk_write(operations, ordered=False)
+            created += result.upserted_count
+            updated += result.modified_count
+            matched += result.matched_count
+            operations.clear()
+
+        for item in self.applications_collection.aggregate(pipeline):
+            new_company = self._new_company(user_id, item['company'])
+            counters = {
+                'application_count': item['application_count'],
+                'status_counts': {
+                    encode_field_key(entry['status']): entry['count']
+                    for entry in item['statuses']
+                }
+            }
+            for field in ('user_id', 'name_key', *counters):
+                new_company.pop(field)
+
+            operations.append(UpdateOne(
+                {'user_id': user_id, 'name_key': item['_id']},
+                {'$setOnInsert': new_company, '$set': counters},
+                upsert=True
+            ))
+            if len(operations) >= batch_size:
+                flush()
+
+        if operations:
+            flush()
+
+        if created:
+            company_name_index.invalidate(user_id)
 
-            # Check if company already exists
-            existing = self.get_company_by_name(company_name, user_id)
-
-            if not existing:
-                # Create new company
-                self.create_company(user_id, company_data)
-                created_count += 1
-
-        return created_count
+        return {
+            'created': created,
+            'updated': updated,
+            'unchanged': matched - updated
+        }
 
     def get_industry_breakdown(self, user_id):
         """Get breakdown of companies by industry."""
@@ -272,25 +357,191 @@ class CompanyService:
         ]
 
     def get_top_companies_by_applications(self, user_id, limit=10):
-        """Get companies with most applications."""
-        # Get all companies
-        companies = list(self.collection.find({'user_id': user_id}))
+        """
+        Get companies with most applications.
 
-        # Count applications for each
-        company_stats = []
-        for company in companies:
-            app_count = self.applications_collection.count_documents({
+        Reads the maintained application_count through the
+        user_application_count index, so only ``limit`` companies are
+        examined however many companies or applications the user has.
+        """
+        companies = list(
+            self.collection.find({
                 'user_id': user_id,
-                'company.name': company['name']
+                'application_count': {'$gt': 0}
             })
+            .sort('application_count', -1)
+            .limit(limit)
+        )
 
-            if app_count > 0:
-                company_stats.append({
-                    'company': company,
-                    'application_count': app_count
-                })
+        return [
+            {'company': company, 'application_count': company['application_count']}
+            for company in companies
+        ]
+
+    def apply_application_changes(self, user_id, added=(), removed=()):
+        """
+        Keep company application counters in step with application writes.
+
+        ``added`` and ``removed`` are application documents; an update is
+        passed as the old document removed and the new one added. All
+        counter changes are sent in a single bulk write.
+        """
+        deltas = defaultdict(Counter)
+        for applications, sign in ((added, 1), (removed, -1)):
+            for app in applications:
+                company = app.get('company', {})
+                name_key = company.get('name_key') or company_name_key(
+                    company.get('name'))
+                if not name_key:
+                    continue
+                status = app.get('application', {}).get('status')
+                deltas[name_key]['application_count'] += sign
+                deltas[name_key][f'status_counts.{encode_field_key(status)}'] += sign
+
+        operations = []
+        for name_key, delta in deltas.items():
+            inc = {key: value for key, value in delta.items() if value}
+            if inc:
+                operations.append(UpdateOne(
+                    {'user_id': user_id, 'name_key': name_key},
+                    {'$inc': inc}
+                ))
+
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def rebuild_application_counters(self, user_id=None, batch_size=1000):
+        """Recompute application counters for every company from scratch."""
+        query = {} if user_id is None else {'user_id': user_id}
+        counters = self._application_counters(query)
+
+        updated = 0
+        operations = []
+        companies = self.collection.find(
+            query, {'user_id': 1, 'name': 1, 'name_key': 1})
+        for company in companies:
+            name_key = company.get('name_key') or company_name_key(
+                company.get('name'))
+            values = counters.get(
+                (company['user_id'], name_key),
+                {'application_count': 0, 'status_counts': {}}
+            )
+            operations.append(UpdateOne(
+                {'_id': company['_id']}, {'$set': values}))
+
+            if len(operations) >= batch_size:
+                updated += self.collection.bulk_write(
+                    operations, ordered=False).matched_count
+                operations = []
+
+        if operations:
+            updated += self.collection.bulk_write(
+                operations, ordered=False).matched_count
+
+        return updated
+
+    def backfill_name_keys(self, batch_size=1000):
+        """
+        Set name_key on companies and company.name_key on applications
+        created before it existed.
+
+        Returns the number of companies and applications updated, and the
+        (user_id, name_key) pairs shared by several companies, which block
+        the unique user_name_key index until they are merged or renamed.
+        """
+        updated_companies = 0
+        operations = []
+        companies = self.collection.find(
+            {'name_key': {'$exists': False}}, {'name': 1})
+        for company in companies:
+            operations.append(UpdateOne(
+                {'_id': company['_id']},
+                {'$set': {'name_key': company_name_key(company.get('name'))}}
+            ))
+            if len(operations) >= batch_size:
+                updated_companies += self.collection.bulk_write(
+                    operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated_companies += self.collection.bulk_write(
+                operations, ordered=False).modified_count
+
+        # One update per distinct (user, company name) rather than per document
+        missing = {
+            'company.name_key': {'$exists': False},
+            'company.name': {'$type': 'string'}
+        }
+        pipeline = [
+            {'$match': missing},
+            {'$group': {'_id': {'user_id': '$user_id', 'name': '$company.name'}}}
+        ]
+
+        updated_applications = 0
+        operations = []
+        for result in self.applications_collection.aggregate(pipeline):
+            user_id, name = result['_id']['user_id'], result['_id']['name']
+            operations.append(UpdateMany(
+                {**missing, 'user_id': user_id, 'company.name': name},
+                {'$set': {'company.name_key': company_name_key(name)}}
+            ))
+            if len(operations) >= batch_size:
+                updated_applications += self.applications_collection.bulk_write(
+                    operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated_applications += self.applications_collection.bulk_write(
+                operations, ordered=False).modified_count
+
+        duplicates = [
+            (result['_id']['user_id'], result['_id']['name_key'])
+            for result in self.collection.aggregate([
+                {'$group': {
+                    '_id': {'user_id': '$user_id', 'name_key': '$name_key'},
+                    'count': {'$sum': 1}
+                }},
+                {'$match': {'count': {'$gt': 1}}}
+            ])
+        ]
 
-        # Sort by application count
-        company_stats.sort(key=lambda x: x['application_count'], reverse=True)
+        company_name_index.clear()
 
-        return company_stats[:limit]
+        return {
+            'companies': updated_companies,
+            'applications': updated_applications,
+            'duplicates': duplicates
+        }
+
+    def _application_counters(self, match):
+        """
+        Count applications per (user_id, company name key) and status.
+
+        Returns a dict keyed by (user_id, name_key) holding the counter
+        fields stored on company documents.
+        """
+        pipeline = [
+            {'$match': match},
+            {'$group': {
+                '_id': {
+                    'user_id': '$user_id',
+                    'name_key': '$company.name_key',
+                    'status': '$application.status'
+                },
+                'count': {'$sum': 1}
+            }}
+        ]
+
+        counters = {}
+        for result in self.applications_collection.aggregate(pipeline):
+            name_key = result['_id'].get('name_key')
+            if not name_key:
+                continue
+            values = counters.setdefault(
+                (result['_id']['user_id'], name_key),
+                {'application_count': 0, 'status_counts': {}}
+            )
+            status_key = encode_field_key(result['_id'].get('status'))
+            values['application_count'] += result['count']
+            values['status_counts'][status_key] = (
+                values['status_counts'].get(status_key, 0) + result['count'])
+
+        return counters
@@ -1,3 +1,37 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .autocomplete import CompanyNameIndex
+
+
+class FakeCollection:
+    """Just enough of a collection for CompanyNameIndex.search."""
+
+    def __init__(self, companies):
+        self.companies = companies
+
+    def find(self, query, projection=None):
+        return iter(self.companies)
+
+
+class CompanyNameIndexTests(SimpleTestCase):
+
+    def test_prefix_search_is_normalized(self):
+        collection = FakeCollection([
+            {'name': 'Google', 'name_key': 'google'},
+            {'name': 'GitLab', 'name_key': 'gitlab'},
+            {'name': 'Stripe', 'name_key': 'stripe'},
+        ])
+
+        results = CompanyNameIndex().search(collection, 1, ' G ')
+
+        self.assertEqual([c['name'] for c in results], ['GitLab', 'Google'])
+
+    def test_duplicate_names_do_not_compare_documents(self):
+        collection = FakeCollection([
+            {'name': 'Acme', 'name_key': 'acme', 'location': 'Berlin'},
+            {'name': 'Acme', 'name_key': 'acme', 'location': 'Paris'},
+        ])
+
+        results = CompanyNameIndex().search(collection, 1, 'ac')
+
+        self.assertEqual(len(results), 2)
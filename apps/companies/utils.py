@@ -0,0 +1,13 @@
+"""
+Company name helpers.
+"""
+
+
+def company_name_key(name):
+    """
+    Normalized company name used for matching: casefolded, whitespace collapsed.
+
+    Stored as ``name_key`` on companies and ``company.name_key`` on
+    applications, so 'Google', 'google' and ' Google ' are the same company.
+    """
+    return ' '.join(str(name or '').split()).casefold()
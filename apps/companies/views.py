@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
 
 from .services import CompanyService
 from .serializers import (
@@ -78,10 +79,17 @@ class CompanyListCreateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            company = service.create_company(
-                user_id=request.user.id,
-                data=serializer.validated_data
-            )
+            try:
+                company = service.create_company(
+                    user_id=request.user.id,
+                    data=serializer.validated_data
+                )
+            except DuplicateKeyError:
+                # Created concurrently since the check above
+                return Response(
+                    {'error': 'Company with this name already exists'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
             response_serializer = CompanySerializer(company)
             return Response(
@@ -112,13 +120,6 @@ class CompanyDetailView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
 
-            # Add application count
-            app_count = service.applications_collection.count_documents({
-                'user_id': request.user.id,
-                'company.name': company['name']
-            })
-            company['application_count'] = app_count
-
             serializer = CompanySerializer(company)
             return Response(serializer.data)
 
@@ -157,6 +158,11 @@ class CompanyDetailView(APIView):
                 {'error': 'Invalid company ID'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except DuplicateKeyError:
+            return Response(
+                {'error': 'Company with this name already exists'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
     def delete(self, request, pk):
         """Delete company."""
@@ -305,11 +311,13 @@ def sync_companies(request):
     Sync companies from existing applications.
     """
     service = CompanyService()
-    created_count = service.sync_companies_from_applications(request.user.id)
+    result = service.sync_companies_from_applications(request.user.id)
 
     return Response({
-        'message': f'Successfully synced {created_count} companies',
-        'created_count': created_count
+        'message': f"Successfully synced {result['created']} companies",
+        'created_count': result['created'],
+        'updated_count': result['updated'],
+        'unchanged_count': result['unchanged']
     })
 
 
@@ -339,10 +347,7 @@ def top_companies(request):
     service = CompanyService()
     data = service.get_top_companies_by_applications(request.user.id, limit)
 
-    results = []
-    for item in data:
-        company_data = CompanySerializer(item['company']).data
-        company_data['application_count'] = item['application_count']
-        results.append(company_data)
-
-    return Response(results)
+    # application_count is part of the serialized company
+    serializer = CompanySerializer(
+        [item['company'] for item in data], many=True)
+    return Response(serializer.data)
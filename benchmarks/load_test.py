@@ -0,0 +1,210 @@
+"""
+HTTP load test for the Job Tracker API.
+
+Drives the main read endpoints with concurrent clients against a running
+server and reports latency percentiles and throughput as JSON.
+
+    python seed_data.py --users 10 --apps 2000 --yes --seed 1
+    python manage.py runserver --noreload   # or gunicorn
+    python benchmarks/load_test.py --users 10 --output before.json
+
+Compare two runs to catch regressions (exits with status 1 if any endpoint's
+p95 got worse than the allowed ratio):
+
+    python benchmarks/load_test.py --users 10 --baseline before.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+PASSWORD = 'DemoPass123!'
+
+ENDPOINTS = {
+    'application_list': '/applications/?page_size=20',
+    'application_detail': '/applications/{application_id}/',
+    'application_search': '/applications/search/?q={term}',
+    'dashboard': '/analytics/dashboard/',
+    'export_applications_csv': '/analytics/export/applications/csv/',
+    'company_list': '/companies/',
+}
+
+SEARCH_TERMS = ['Google', 'Engineer', 'Python', 'Developer', 'Stripe', 'excited']
+
+_local = threading.local()
+
+
+def user_emails(num_users):
+    """Accounts created by ``seed_data.py --users N``."""
+    return ['demo@example.com'] + [
+        f'bench{i}@example.com' for i in range(1, num_users)
+    ]
+
+
+def login(base_url, email, password):
+    response = requests.post(f'{base_url}/auth/login/', json={
+        'email': email,
+        'password': password
+    })
+    response.raise_for_status()
+    return response.json()['access']
+
+
+def prepare_clients(base_url, emails, password):
+    """Log each user in and collect application ids for detail requests."""
+    clients = []
+    for email in emails:
+        headers = {'Authorization': f'Bearer {login(base_url, email, password)}'}
+        response = requests.get(
+            f'{base_url}/applications/?page_size=100', headers=headers)
+        response.raise_for_status()
+        ids = [app['id'] for app in response.json()['results']]
+        if not ids:
+            raise SystemExit(f'{email} has no applications, run seed_data.py first')
+        clients.append({'headers': headers, 'application_ids': ids})
+    return clients
+
+
+def session():
+    """One keep-alive session per worker thread."""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def timed_request(base_url, path, client):
+    url = base_url + path.format(
+        application_id=random.choice(client['application_ids']),
+        term=random.choice(SEARCH_TERMS)
+    )
+    started = time.perf_counter()
+    try:
+        response = session().get(url, headers=client['headers'])
+        # Read the whole body so streaming responses are fully timed
+        size = len(response.content)
+        ok = response.status_code < 400
+    except requests.RequestException:
+        size, ok = 0, False
+    return (time.perf_counter() - started) * 1000, ok, size
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_endpoint(base_url, path, clients, requests_count, concurrency):
+    """Fire ``requests_count`` requests at one endpoint and summarize them."""
+    jobs = [random.choice(clients) for _ in range(requests_count)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda client: timed_request(base_url, path, client), jobs))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _, _ in results)
+    errors = sum(1 for _, ok, _ in results if not ok)
+
+    return {
+        'path': path,
+        'requests': requests_count,
+        'errors': errors,
+        'throughput_rps': round(requests_count / elapsed, 2),
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(latencies[-1], 2),
+        'avg_bytes': round(statistics.mean(size for _, _, size in results)),
+    }
+
+
+def compare(report, baseline, max_ratio):
+    """List endpoints whose p95 regressed by more than ``max_ratio``."""
+    regressions = []
+    for name, result in report['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before or not before['p95_ms']:
+            continue
+        ratio = result['p95_ms'] / before['p95_ms']
+        if ratio > max_ratio:
+            regressions.append({
+                'endpoint': name,
+                'baseline_p95_ms': before['p95_ms'],
+                'p95_ms': result['p95_ms'],
+                'ratio': round(ratio, 2),
+            })
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test the Job Tracker API.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000/api')
+    parser.add_argument('--users', type=int, default=1,
+                        help='Number of seeded users to spread requests over.')
+    parser.add_argument('--password', default=PASSWORD)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Requests per endpoint.')
+    parser.add_argument('--warmup', type=int, default=10,
+                        help='Untimed requests per endpoint before measuring.')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help='Comma separated subset of: ' + ', '.join(ENDPOINTS))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write the JSON report to this file.')
+    parser.add_argument('--baseline', help='Previous JSON report to compare against.')
+    parser.add_argument('--max-ratio', type=float, default=1.2,
+                        help='Allowed p95 slowdown against the baseline.')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+
+    clients = prepare_clients(
+        args.base_url, user_emails(args.users), args.password)
+
+    report = {
+        'base_url': args.base_url,
+        'users': args.users,
+        'concurrency': args.concurrency,
+        'requests_per_endpoint': args.requests,
+        'endpoints': {},
+    }
+
+    for name in args.endpoints.split(','):
+        path = ENDPOINTS[name.strip()]
+        for _ in range(args.warmup):
+            timed_request(args.base_url, path, random.choice(clients))
+        report['endpoints'][name.strip()] = run_endpoint(
+            args.base_url, path, clients, args.requests, args.concurrency)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(report, json.load(f), args.max_ratio)
+        exit_code = 1 if report['regressions'] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
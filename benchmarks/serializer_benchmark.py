@@ -0,0 +1,115 @@
+"""
+Microbenchmark for ApplicationSerializer list output.
+
+Serializes pages of generated application documents through DRF's generic
+Serializer.to_representation and through the compiled path, checks that the
+rendered JSON is byte-identical and reports the timings as JSON.
+
+    python benchmarks/serializer_benchmark.py --page-size 100 --timeline 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from bson import ObjectId  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.applications.serializers import ApplicationSerializer  # noqa: E402
+from seed_data import generate_application  # noqa: E402
+
+
+class ReferenceApplicationSerializer(ApplicationSerializer):
+    """ApplicationSerializer through DRF's generic field walk."""
+
+    def to_representation(self, instance):
+        rep = serializers.Serializer.to_representation(self, instance)
+        if '_id' in instance:
+            rep['id'] = str(instance['_id'])
+        return rep
+
+
+def make_documents(count, timeline_events):
+    """Generated applications with long timelines and some edge cases."""
+    documents = []
+    for i in range(count):
+        app = generate_application(1, random.randint(1, 90))
+        app['_id'] = ObjectId()
+        event = app['timeline'][-1]
+        while len(app['timeline']) < timeline_events:
+            event = dict(event, date=event['date'] + timedelta(hours=6))
+            app['timeline'].append(event)
+
+        if i % 7 == 0:
+            # Aware datetimes, missing optional keys and nulls
+            app['updated_at'] = app['updated_at'].replace(tzinfo=timezone.utc)
+            del app['application']['status']
+            del app['notes']
+            app['job']['salary_max'] = None
+        documents.append(app)
+    return documents
+
+
+def time_serializer(serializer_class, documents, repeat):
+    renderer = JSONRenderer()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = renderer.render(serializer_class(documents, many=True).data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return output, timings
+
+
+def summarize(timings):
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ApplicationSerializer output.')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--timeline', type=int, default=20,
+                        help='Timeline events per application.')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    documents = make_documents(args.page_size, args.timeline)
+
+    reference, reference_timings = time_serializer(
+        ReferenceApplicationSerializer, documents, args.repeat)
+    compiled, compiled_timings = time_serializer(
+        ApplicationSerializer, documents, args.repeat)
+
+    report = {
+        'page_size': args.page_size,
+        'timeline_events': args.timeline,
+        'repeat': args.repeat,
+        'identical_json': reference == compiled,
+        'drf': summarize(reference_timings),
+        'compiled': summarize(compiled_timings),
+        'speedup': round(
+            statistics.median(reference_timings) / statistics.median(compiled_timings), 2),
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report['identical_json'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+MongoDB index definitions and bootstrap helpers.
+
+Every index the services rely on is declared here. ``ensure_indexes`` creates
+or verifies them; it is used by ``manage.py ensure_indexes`` and, when
+MONGODB_SETTINGS['ensure_indexes'] is enabled, at application startup.
+"""
+
+import logging
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from config.mongodb import get_collection
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEXES = {
+    'applications': [
+        # List, keyset pagination, analytics $match and rollup rebuilds
+        IndexModel(
+            [('user_id', ASCENDING), ('created_at', DESCENDING),
+             ('_id', DESCENDING)],
+            name='user_created'
+        ),
+        # List filtered by status, status exports
+        IndexModel(
+            [('user_id', ASCENDING), ('application.status', ASCENDING),
+             ('created_at', DESCENDING)],
+            name='user_status_created'
+        ),
+        # Company applications, company stats and counter aggregations
+        IndexModel(
+            [('user_id', ASCENDING), ('company.name_key', ASCENDING),
+             ('application.status', ASCENDING)],
+            name='user_company_key_status'
+        ),
+        # Full text search, always scoped to one user
+        IndexModel(
+            [('user_id', ASCENDING), ('company.name', TEXT),
+             ('job.title', TEXT), ('notes', TEXT)],
+            name='user_text'
+        ),
+    ],
+    'companies': [
+        IndexModel(
+            [('user_id', ASCENDING), ('name', ASCENDING)],
+            name='user_name',
+            unique=True
+        ),
+        # Case and whitespace insensitive name lookups
+        IndexModel(
+            [('user_id', ASCENDING), ('name_key', ASCENDING)],
+            name='user_name_key',
+            unique=True
+        ),
+        # Top companies from maintained counters
+        IndexModel(
+            [('user_id', ASCENDING), ('application_count', DESCENDING)],
+            name='user_application_count'
+        ),
+    ],
+    'user_analytics': [
+        IndexModel(
+            [('user_id', ASCENDING)],
+            name='user',
+            unique=True
+        ),
+    ],
+}
+
+
+# Indexes replaced by a later definition, dropped by drop_superseded_indexes
+SUPERSEDED_INDEXES = {
+    'applications': ['user_company_status'],
+}
+
+
+def drop_superseded_indexes():
+    """Drop indexes replaced by newer definitions; returns their names."""
+    dropped = []
+    for collection_name, names in SUPERSEDED_INDEXES.items():
+        collection = get_collection(collection_name)
+        existing = collection.index_information()
+        for name in names:
+            if name in existing:
+                collection.drop_index(name)
+                dropped.append(f'{collection_name}.{name}')
+    return dropped
+
+
+def ensure_indexes(create=True):
+    """
+    Create (or with ``create=False`` only verify) the declared indexes.
+
+    Returns a report per collection listing indexes that were created,
+    already present, missing, failed to build, present but not declared
+    ("unexpected"), and never used since the server started ("unused").
+    """
+    report = {}
+
+    for collection_name, models in INDEXES.items():
+        collection = get_collection(collection_name)
+        existing = collection.index_information()
+        expected = {model.document['name'] for model in models}
+
+        entry = {
+            'created': [],
+            'present': [],
+            'missing': [],
+            'failed': {},
+            'unexpected': [
+                name for name in existing
+                if name != '_id_' and name not in expected
+            ],
+            'unused': [],
+        }
+
+        for model in models:
+            name = model.document['name']
+            if name in existing:
+                entry['present'].append(name)
+            elif not create:
+                entry['missing'].append(name)
+            else:
+                try:
+                    collection.create_indexes([model])
+                    entry['created'].append(name)
+                except OperationFailure as exc:
+                    entry['failed'][name] = str(exc)
+
+        # Access counters reset on server restart; needs clusterMonitor
+        try:
+            for stats in collection.aggregate([{'$indexStats': {}}]):
+                if stats['name'] != '_id_' and stats['accesses']['ops'] == 0:
+                    entry['unused'].append(stats['name'])
+        except OperationFailure:
+            pass
+
+        report[collection_name] = entry
+
+    return report
+
+
+def startup_index_check(mode):
+    """
+    Run the index check on startup and log problems.
+
+    ``mode`` is 'create' to build missing indexes, 'check' to only report
+    them, anything else to skip. Errors are logged, never raised, so a
+    database outage does not prevent the app from booting.
+    """
+    if mode not in ('check', 'create'):
+        return
+
+    try:
+        report = ensure_indexes(create=(mode == 'create'))
+    except PyMongoError as exc:
+        logger.error('MongoDB index check failed: %s', exc)
+        return
+
+    for collection_name, entry in report.items():
+        if entry['created']:
+            logger.info('Created indexes on %s: %s',
+                        collection_name, ', '.join(entry['created']))
+        if entry['missing']:
+            logger.warning('Missing indexes on %s: %s',
+                           collection_name, ', '.join(entry['missing']))
+        for name, error in entry['failed'].items():
+            logger.error('Could not create index %s on %s: %s',
+                         name, collection_name, error)
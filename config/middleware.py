@@ -0,0 +1,114 @@
+"""
+Project middleware.
+"""
+
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from config import monitoring, timing
+
+
+logger = logging.getLogger(__name__)
+
+
+class MongoMonitoringMiddleware:
+    """Attribute MongoDB commands to the endpoint serving the request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = monitoring.start_request(f'{request.method} {request.path}')
+        try:
+            return self.get_response(request)
+        finally:
+            monitoring.end_request(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Label by route pattern so /api/companies/<id>/ aggregates as one
+        stats = monitoring.current_request()
+        match = request.resolver_match
+        if stats is not None and match is not None:
+            stats.endpoint = f'{request.method} /{match.route}'
+        return None
+
+
+class ServerTimingMiddleware:
+    """
+    Report where request time goes in a Server-Timing header.
+
+    Metrics: total, mongo (from the command listener, so this must run inside
+    MongoMonitoringMiddleware), db (Django ORM/SQLite, e.g. the JWT user
+    lookup), serialize (DRF serializer.data) and render (JSON rendering).
+    Streaming responses only include the time to start the stream.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'SERVER_TIMING', True)
+        self.log = getattr(settings, 'SERVER_TIMING_LOG', False)
+        if self.enabled:
+            timing.instrument_serializers()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = timing.start()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._time_sql):
+                response = self.get_response(request)
+            measured = timing.current()
+        finally:
+            timing.stop(token)
+
+        mongo = monitoring.current_request()
+        timings = {
+            'total': (time.perf_counter() - started) * 1000,
+            'mongo': mongo.duration_ms if mongo is not None else 0.0,
+            'db': measured.get('db', 0.0),
+            'serialize': measured.get('serialize', 0.0),
+            'render': measured.get('render', 0.0),
+        }
+
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration:.1f}'
+            for name, duration in timings.items()
+        )
+
+        if self.log:
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'endpoint': mongo.endpoint if mongo is not None else None,
+                'status': response.status_code,
+                'mongo_commands': mongo.commands if mongo is not None else 0,
+                **{f'{name}_ms': round(duration, 2)
+                   for name, duration in timings.items()},
+            }))
+
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook returns
+        if self.enabled and hasattr(response, 'add_post_render_callback'):
+            render_started = time.perf_counter()
+
+            def finished(rendered):
+                timing.add('render', (time.perf_counter() - render_started) * 1000)
+
+            response.add_post_render_callback(finished)
+        return response
+
+    @staticmethod
+    def _time_sql(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            timing.add('db', (time.perf_counter() - started) * 1000)
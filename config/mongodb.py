@@ -3,8 +3,80 @@ MongoDB connection utility using PyMongo.
 This provides a singleton connection to MongoDB.
 """
 
+import importlib.util
+import logging
+
 from pymongo import MongoClient
 
+from config.monitoring import command_monitor
+
+
+logger = logging.getLogger(__name__)
+
+
+# Python modules required by each wire compressor
+COMPRESSOR_MODULES = {
+    'zstd': 'zstandard',
+    'snappy': 'snappy',
+    'zlib': 'zlib',
+}
+
+
+def _available_compressors(compressors):
+    """
+    Filter a comma separated compressor list down to installed ones,
+    warning about each configured compressor that cannot be used.
+    """
+    available = []
+    for name in compressors.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None:
+            logger.warning('Unknown MongoDB compressor %r ignored', name)
+        elif importlib.util.find_spec(module) is None:
+            logger.warning(
+                'MongoDB compressor %r disabled: the %r package is not '
+                'installed', name, module)
+        else:
+            available.append(name)
+    return available
+
+
+def _client_options(mongo_settings):
+    """Build MongoClient keyword arguments from MONGODB_SETTINGS."""
+    options = {
+        'appname': mongo_settings.get('app_name', 'job-tracker-backend'),
+        'maxPoolSize': mongo_settings.get('max_pool_size', 50),
+        'minPoolSize': mongo_settings.get('min_pool_size', 0),
+        'maxIdleTimeMS': mongo_settings.get('max_idle_time_ms', 300000),
+        'serverSelectionTimeoutMS': mongo_settings.get('server_selection_timeout_ms', 5000),
+        'connectTimeoutMS': mongo_settings.get('connect_timeout_ms', 10000),
+        'socketTimeoutMS': mongo_settings.get('socket_timeout_ms', 30000),
+    }
+
+    compressors = _available_compressors(
+        mongo_settings.get('compressors', ''))
+    if compressors:
+        options['compressors'] = compressors
+
+    if mongo_settings.get('read_concern'):
+        options['readConcernLevel'] = mongo_settings['read_concern']
+
+    write_concern = mongo_settings.get('write_concern')
+    if write_concern:
+        options['w'] = int(write_concern) if write_concern.isdigit() else write_concern
+
+    if mongo_settings.get('monitor_commands', True):
+        command_monitor.configure(
+            slow_ms=mongo_settings.get('slow_query_ms', 100),
+            tag_callers=mongo_settings.get('tag_callers', True)
+        )
+        options['event_listeners'] = [command_monitor]
+
+    return options
+
 
 class MongoDB:
     """Singleton MongoDB connection class."""
@@ -12,6 +84,7 @@ class MongoDB:
     _instance = None
     _client = None
     _db = None
+    _collections = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -38,8 +111,10 @@ class MongoDB:
             )
         
         try:
-            self._client = MongoClient(connection_string)
+            self._client = MongoClient(
+                connection_string, **_client_options(mongo_settings))
             self._db = self._client[mongo_settings['db_name']]
+            self._collections = {}
             
             # Test connection
             self._client.admin.command('ping')
@@ -65,7 +140,11 @@ class MongoDB:
     
     def get_collection(self, collection_name):
         """Get a specific collection."""
-        return self.db[collection_name]
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self.db[collection_name]
+            self._collections[collection_name] = collection
+        return collection
     
     def close(self):
         """Close MongoDB connection."""
@@ -73,8 +152,21 @@ class MongoDB:
             self._client.close()
             self._client = None
             self._db = None
+            self._collections = {}
             print("MongoDB connection closed.")
 
+    def reset(self):
+        """
+        Forget the current client without closing it.
+
+        Used in forked worker processes: the client inherited from the parent
+        shares its sockets, so the child must not use or close it and instead
+        connects again on first use.
+        """
+        self._client = None
+        self._db = None
+        self._collections = {}
+
 
 # Global MongoDB instance - lazy initialization
 mongodb = None
@@ -102,3 +194,34 @@ def close_connection():
     global mongodb
     if mongodb:
         mongodb.close()
+
+
+def reset_connection():
+    """Drop an inherited MongoDB client after fork (see MongoDB.reset)."""
+    global mongodb
+    if mongodb:
+        mongodb.reset()
+
+
+def encode_field_key(value):
+    """
+    Encode a value for use as a MongoDB field name.
+
+    Counter maps are keyed by user data (statuses, skills, sources), which may
+    contain '.' or '$'. Those are escaped so the key can be used in $inc paths.
+    """
+    if value is None:
+        return '%00'
+    value = str(value)
+    if value == '':
+        return '%'
+    return value.replace('%', '%25').replace('.', '%2E').replace('$', '%24')
+
+
+def decode_field_key(key):
+    """Reverse encode_field_key."""
+    if key == '%00':
+        return None
+    if key == '%':
+        return ''
+    return key.replace('%2E', '.').replace('%24', '$').replace('%25', '%')
@@ -0,0 +1,205 @@
+"""
+MongoDB command monitoring.
+
+A pymongo CommandListener that times every command, tags it with the service
+method that issued it and the endpoint being served, logs slow commands with
+the shape of their filter, and keeps aggregated counters per endpoint.
+
+Counters live in process memory, so with several gunicorn workers each one
+reports its own traffic.
+"""
+
+import logging
+import sys
+import threading
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+
+logger = logging.getLogger(__name__)
+
+# Commands that are not application queries
+IGNORED_COMMANDS = {
+    'ping', 'hello', 'ismaster', 'isMaster', 'buildInfo', 'endSessions',
+    'saslStart', 'saslContinue', 'authenticate', 'getnonce',
+}
+
+# Where each command keeps its filter
+FILTER_FIELDS = {
+    'find': 'filter',
+    'count': 'query',
+    'distinct': 'query',
+    'findAndModify': 'query',
+}
+
+
+class RequestStats:
+    """Mongo activity of the request currently being served."""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.commands = 0
+        self.duration_ms = 0.0
+
+
+_current_request = ContextVar('mongo_request_stats', default=None)
+
+
+def start_request(endpoint):
+    """Start collecting stats for a request; returns a token for end_request."""
+    return _current_request.set(RequestStats(endpoint))
+
+
+def end_request(token):
+    """Stop collecting stats for the request started with ``token``."""
+    _current_request.reset(token)
+
+
+def current_request():
+    """Get the RequestStats of the current request, if any."""
+    return _current_request.get()
+
+
+def filter_shape(value):
+    """Replace the values in a query with 1, keeping only its structure."""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [filter_shape(item) for item in value]
+        if all(shape == 1 for shape in shapes):
+            return 1
+        return shapes
+    return 1
+
+
+def _command_filter(command_name, command):
+    """Extract the filter of a command, if it has one."""
+    if command_name in FILTER_FIELDS:
+        return command.get(FILTER_FIELDS[command_name])
+    if command_name == 'aggregate':
+        pipeline = command.get('pipeline') or [{}]
+        return pipeline[0].get('$match')
+    if command_name in ('update', 'delete'):
+        statements = command.get(command_name + 's') or [{}]
+        return statements[0].get('q')
+    return None
+
+
+def _calling_method():
+    """Find the first application frame on the stack, e.g. 'CompanyService.get_companies'."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('apps.'):
+            instance = frame.f_locals.get('self')
+            if instance is not None:
+                return f'{type(instance).__name__}.{frame.f_code.co_name}'
+            return f'{module}.{frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Times MongoDB commands and aggregates them per endpoint and caller."""
+
+    def __init__(self, slow_ms=100, tag_callers=True):
+        self.slow_ms = slow_ms
+        self.tag_callers = tag_callers
+        self._pending = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def configure(self, slow_ms=None, tag_callers=None):
+        """Update the slow command threshold and caller tagging."""
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        if tag_callers is not None:
+            self.tag_callers = tag_callers
+
+    def started(self, event):
+        command_name = event.command_name
+        if command_name in IGNORED_COMMANDS:
+            return
+
+        command = event.command
+        collection = command.get(command_name)
+        if command_name == 'getMore':
+            collection = command.get('collection')
+        if not isinstance(collection, str):
+            collection = None
+
+        request = current_request()
+        self._pending[(event.connection_id, event.request_id)] = {
+            'command': command_name,
+            'collection': collection,
+            'filter': _command_filter(command_name, command),
+            'caller': _calling_method() if self.tag_callers else None,
+            'request': request,
+        }
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed):
+        record = self._pending.pop((event.connection_id, event.request_id), None)
+        if record is None:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        request = record['request']
+        endpoint = request.endpoint if request else None
+
+        if request is not None:
+            request.commands += 1
+            request.duration_ms += duration_ms
+
+        key = (endpoint, record['caller'],
+               record['command'], record['collection'])
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    'count': 0, 'failures': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            stats['count'] += 1
+            stats['failures'] += int(failed)
+            stats['total_ms'] += duration_ms
+            stats['max_ms'] = max(stats['max_ms'], duration_ms)
+
+        if self.slow_ms is not None and duration_ms >= self.slow_ms:
+            logger.warning(
+                'Slow MongoDB %s on %s took %.1fms (caller=%s endpoint=%s filter=%s)',
+                record['command'], record['collection'], duration_ms,
+                record['caller'], endpoint, filter_shape(record['filter'])
+            )
+
+    def snapshot(self, reset=False):
+        """Get aggregated counters, slowest total time first."""
+        with self._lock:
+            items = list(self._stats.items())
+            if reset:
+                self._stats = {}
+
+        results = []
+        for (endpoint, caller, command, collection), stats in items:
+            results.append({
+                'endpoint': endpoint,
+                'caller': caller,
+                'command': command,
+                'collection': collection,
+                'count': stats['count'],
+                'failures': stats['failures'],
+                'total_ms': round(stats['total_ms'], 2),
+                'avg_ms': round(stats['total_ms'] / stats['count'], 2),
+                'max_ms': round(stats['max_ms'], 2),
+            })
+
+        results.sort(key=lambda item: item['total_ms'], reverse=True)
+        return results
+
+
+# Global listener registered on the MongoClient by config/mongodb.py
+command_monitor = CommandMonitor()
@@ -53,8 +53,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.middleware.MongoMonitoringMiddleware',
+    'config.middleware.ServerTimingMiddleware',
 ]
 
+# Server-Timing header with total/mongo/db/serialize/render durations, and an
+# optional JSON log line per request
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+SERVER_TIMING_LOG = os.getenv('SERVER_TIMING_LOG', 'False') == 'True'
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -92,8 +99,45 @@ MONGODB_SETTINGS = {
     'port': int(os.getenv('MONGO_PORT', '27017')),
     'username': os.getenv('MONGO_USERNAME', ''),
     'password': os.getenv('MONGO_PASSWORD', ''),
+
+    # Connection pool (per process; each gunicorn worker has its own client)
+    'app_name': os.getenv('MONGO_APP_NAME', 'job-tracker-backend'),
+    'max_pool_size': int(os.getenv('MONGO_MAX_POOL_SIZE', '50')),
+    'min_pool_size': int(os.getenv('MONGO_MIN_POOL_SIZE', '0')),
+    'max_idle_time_ms': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000')),
+
+    # Timeouts
+    'server_selection_timeout_ms': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+    'connect_timeout_ms': int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '10000')),
+    'socket_timeout_ms': int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '30000')),
+
+    # Wire compression, in order of preference. Compressors whose Python
+    # module is not installed (zstandard, python-snappy) are skipped.
+    'compressors': os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib'),
+
+    # Read/write concern (empty = server default)
+    'read_concern': os.getenv('MONGO_READ_CONCERN', ''),
+    'write_concern': os.getenv('MONGO_WRITE_CONCERN', ''),
+
+    # Index check when the WSGI app starts: 'off', 'check' or 'create'
+    'ensure_indexes': os.getenv('MONGO_ENSURE_INDEXES', 'off'),
+
+    # Command monitoring: latency counters per endpoint and a slow query log
+    'monitor_commands': os.getenv('MONGO_MONITOR_COMMANDS', 'True') == 'True',
+    'slow_query_ms': int(os.getenv('MONGO_SLOW_QUERY_MS', '100')),
+    'tag_callers': os.getenv('MONGO_TAG_CALLERS', 'True') == 'True',
 }
 
+# In-process company autocomplete index: users kept, seconds before reload
+COMPANY_AUTOCOMPLETE_CACHE_USERS = int(os.getenv('COMPANY_AUTOCOMPLETE_CACHE_USERS', '1000'))
+COMPANY_AUTOCOMPLETE_TTL = int(os.getenv('COMPANY_AUTOCOMPLETE_TTL', '300'))
+
+# Seconds company stats are cached (per process unless CACHES is shared)
+COMPANY_STATS_CACHE_TTL = int(os.getenv('COMPANY_STATS_CACHE_TTL', '60'))
+
+# Largest list accepted by POST /api/applications/bulk/
+BULK_APPLICATIONS_MAX = int(os.getenv('BULK_APPLICATIONS_MAX', '500'))
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -212,7 +256,11 @@ CORS_ALLOW_HEADERS = [
 ]
 
 # File Upload Settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+# Uploads larger than FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to a temporary
+# file and streamed to storage in chunks, so MAX_UPLOAD_SIZE can be raised
+# without raising memory use.
+MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', '5242880'))  # 5MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', '5242880'))  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
 ALLOWED_FILE_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt']
@@ -0,0 +1,65 @@
+"""
+Per-request timers reported in the Server-Timing header.
+
+ServerTimingMiddleware starts a set of timers for each request; code running
+inside the request adds to them with ``add``. Serializer time is collected by
+wrapping DRF's ``BaseSerializer.data`` once at startup.
+"""
+
+import time
+from contextvars import ContextVar
+
+from rest_framework.serializers import BaseSerializer
+
+
+_timings = ContextVar('request_timings', default=None)
+
+# Nesting level of serializer.data calls in the current context
+_serializer_depth = ContextVar('serializer_depth', default=0)
+
+
+def start():
+    """Start timing a request; returns a token for ``stop``."""
+    return _timings.set({})
+
+
+def stop(token):
+    """Stop timing the request started with ``token``."""
+    _timings.reset(token)
+
+
+def current():
+    """Get the timings (name -> milliseconds) of the current request, if any."""
+    return _timings.get()
+
+
+def add(name, duration_ms):
+    """Add time to a named timer of the current request."""
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + duration_ms
+
+
+def instrument_serializers():
+    """Time ``serializer.data`` under the 'serialize' timer."""
+    data = BaseSerializer.data
+    if getattr(data.fget, 'timed', False):
+        return
+
+    def timed_data(serializer):
+        # Only the outermost call is timed so nested serializers are not
+        # counted twice.
+        depth = _serializer_depth.get()
+        if depth or _timings.get() is None:
+            return data.fget(serializer)
+
+        token = _serializer_depth.set(depth + 1)
+        started = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            add('serialize', (time.perf_counter() - started) * 1000)
+            _serializer_depth.reset(token)
+
+    timed_data.timed = True
+    BaseSerializer.data = property(timed_data)
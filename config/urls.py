@@ -2,13 +2,15 @@
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView
 )
+from config.monitoring import command_monitor
 
 
 @api_view(['GET'])
@@ -30,6 +32,21 @@ def api_root(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def mongo_stats(request):
+    """
+    GET /api/monitoring/mongo/
+    MongoDB command counters of this worker process (admin only).
+    Pass ?reset=true to clear them after reading.
+    """
+    reset = request.query_params.get('reset', 'false').lower() == 'true'
+    return Response({
+        'slow_query_ms': command_monitor.slow_ms,
+        'results': command_monitor.snapshot(reset=reset)
+    })
+
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -48,6 +65,9 @@ urlpatterns = [
     path('api/applications/', include('apps.applications.urls')),
     path('api/companies/', include('apps.companies.urls')),
     path('api/analytics/', include('apps.analytics.urls')),
+
+    # Monitoring
+    path('api/monitoring/mongo/', mongo_stats, name='mongo_stats'),
 ]
 
 if settings.DEBUG:
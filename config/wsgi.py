@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Optionally create or verify MongoDB indexes (see config/indexes.py)
+from django.conf import settings  # noqa: E402
+from config.indexes import startup_index_check  # noqa: E402
+
+startup_index_check(settings.MONGODB_SETTINGS.get('ensure_indexes', 'off'))
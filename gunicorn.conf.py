@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration.
+
+Gunicorn loads this file automatically when started from the project root,
+e.g. ``gunicorn config.wsgi:application``.
+"""
+
+
+def post_fork(server, worker):
+    """Give each worker its own MongoDB client and connection pool."""
+    from config.mongodb import reset_connection
+    reset_connection()
+
+
+def worker_exit(server, worker):
+    """Close the worker's MongoDB connections on shutdown."""
+    from config.mongodb import close_connection
+    close_connection()
@@ -1,10 +1,17 @@
 """
 Data seeding script for Job Application Tracker.
 Creates realistic sample applications for testing and ML training.
+
+Run without arguments for the interactive demo seed, or non-interactively
+for benchmarks, e.g.:
+
+    python seed_data.py --users 20 --apps 5000 --yes
 """
 
 from config.mongodb import get_collection
+from apps.companies.utils import company_name_key
 from django.contrib.auth import get_user_model
+import argparse
 import os
 import django
 import random
@@ -104,18 +111,19 @@ EVENT_TYPES = [
 ]
 
 
-def create_sample_user():
-    """Create a sample user if not exists."""
-    email = 'demo@example.com'
+DEMO_PASSWORD = 'DemoPass123!'
 
+
+def create_sample_user(email='demo@example.com', first_name='Demo'):
+    """Create a sample user if not exists."""
     try:
         user = User.objects.get(email=email)
         print(f'✅ Using existing user: {email}')
     except User.DoesNotExist:
         user = User.objects.create_user(
             email=email,
-            password='DemoPass123!',
-            first_name='Demo',
+            password=DEMO_PASSWORD,
+            first_name=first_name,
             last_name='User'
         )
         user.skills = ['Python', 'Django', 'React', 'MongoDB', 'AWS', 'Docker']
@@ -127,6 +135,14 @@ def create_sample_user():
     return user
 
 
+def create_sample_users(num_users):
+    """Create the demo user plus numbered benchmark users (bench1@example.com, ...)."""
+    users = [create_sample_user()]
+    for i in range(1, num_users):
+        users.append(create_sample_user(f'bench{i}@example.com', f'Bench{i}'))
+    return users
+
+
 def generate_timeline_events(applied_date, status, num_events):
     """Generate realistic timeline events."""
     timeline = []
@@ -239,7 +255,7 @@ def generate_application(user_id, days_ago):
 
     application = {
         'user_id': user_id,
-        'company': company,
+        'company': {**company, 'name_key': company_name_key(company['name'])},
         'job': {
             'title': job_title,
             'description': f'Looking for a {job_title} to join our team.',
@@ -285,70 +301,112 @@ def generate_application(user_id, days_ago):
     return application
 
 
-def seed_applications(user, num_applications=50):
-    """Seed applications for a user."""
+def seed_applications(user, num_applications=50, batch_size=1000):
+    """Seed applications for a user, inserting them in batches."""
     collection = get_collection('applications')
 
-    print(f'\n🌱 Seeding {num_applications} applications...')
+    print(f'\n🌱 Seeding {num_applications} applications for {user.email}...')
 
-    applications = []
+    statuses = {}
+    created = 0
+    batch = []
 
     # Generate applications spread over last 90 days
     for i in range(num_applications):
         days_ago = random.randint(1, 90)
         app = generate_application(user.id, days_ago)
-        applications.append(app)
+        status = app['application']['status']
+        statuses[status] = statuses.get(status, 0) + 1
+        batch.append(app)
 
-    # Insert all applications
-    result = collection.insert_many(applications)
+        if len(batch) >= batch_size:
+            created += len(collection.insert_many(batch, ordered=False).inserted_ids)
+            batch = []
 
-    print(f'✅ Created {len(result.inserted_ids)} applications')
+    if batch:
+        created += len(collection.insert_many(batch, ordered=False).inserted_ids)
 
-    # Print summary
-    statuses = {}
-    for app in applications:
-        status = app['application']['status']
-        statuses[status] = statuses.get(status, 0) + 1
+    print(f'✅ Created {created} applications')
 
+    # Print summary
     print('\n📊 Status Summary:')
     for status, count in sorted(statuses.items()):
         print(f'   {status}: {count}')
 
 
+def refresh_derived_data(user):
+    """Create companies with their counters and build the analytics rollup."""
+    from apps.analytics.rollup import AnalyticsRollupService
+    from apps.companies.services import CompanyService
+
+    CompanyService().sync_companies_from_applications(user.id)
+    AnalyticsRollupService().rebuild(user.id)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=1,
+                        help='Number of users to seed (demo user + benchmark users).')
+    parser.add_argument('--apps', type=int,
+                        help='Applications per user (prompted for if omitted).')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Applications per insert_many call.')
+    parser.add_argument('--seed', type=int,
+                        help='Random seed for reproducible data.')
+    parser.add_argument('--yes', action='store_true',
+                        help='Delete existing data of seeded users without asking.')
+    return parser.parse_args()
+
+
 def main():
     """Main seeding function."""
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
     print('=' * 60)
     print('JOB APPLICATION TRACKER - DATA SEEDING')
     print('=' * 60)
 
-    # Create/get user
-    user = create_sample_user()
+    # Create/get users
+    users = create_sample_users(max(args.users, 1))
+    user_ids = [user.id for user in users]
 
     # Check existing applications
     collection = get_collection('applications')
-    existing = collection.count_documents({'user_id': user.id})
+    existing = collection.count_documents({'user_id': {'$in': user_ids}})
 
     if existing > 0:
         print(f'\n⚠️  Found {existing} existing applications')
-        response = input('Delete existing and reseed? (yes/no): ')
+        response = 'yes' if args.yes else input(
+            'Delete existing and reseed? (yes/no): ')
         if response.lower() == 'yes':
-            collection.delete_many({'user_id': user.id})
+            collection.delete_many({'user_id': {'$in': user_ids}})
+            get_collection('companies').delete_many(
+                {'user_id': {'$in': user_ids}})
             print('✅ Deleted existing applications')
         else:
             print('❌ Seeding cancelled')
             return
 
     # Seed applications
-    num_apps = int(
-        input('\nHow many applications to create? (default 50): ') or 50)
-    seed_applications(user, num_apps)
+    num_apps = args.apps
+    if num_apps is None:
+        num_apps = 50 if args.yes else int(
+            input('\nHow many applications to create? (default 50): ') or 50)
+
+    for user in users:
+        seed_applications(user, num_apps, args.batch_size)
+        refresh_derived_data(user)
 
     print('\n' + '=' * 60)
     print('✅ SEEDING COMPLETED!')
     print('=' * 60)
     print(f'\nUser credentials:')
     print(f'  Email: demo@example.com')
-    print(f'  Password: DemoPass123!')
+    if len(users) > 1:
+        print(f'  Benchmark users: bench1..bench{len(users) - 1}@example.com')
+    print(f'  Password: {DEMO_PASSWORD}')
     print(f'\nYou can now:')
     print(f'  1. Login with these credentials')
     print(f'  2. View applications: GET /api/applications/')